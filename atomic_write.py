@@ -0,0 +1,112 @@
+"""Atomic output files: a reader sees the old or the new file, never a partial one."""
+
+import os
+import hashlib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Callable, Iterable, Iterator, Optional, Tuple
+
+
+@contextmanager
+def open_atomic(path: str, mode: str = "wb", **options) -> Iterator[IO]:
+    """Open a temp file in the directory of ``path``; on a clean exit it is
+    fsynced and renamed over ``path``, so a reader sees the old or the new
+    file, never a partial one. On an error the temp file is removed."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_file = os.path.join(
+        directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        with os.fdopen(fd, mode, **options) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.unlink(tmp_file)
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        # make the rename itself durable
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def write_atomic(path: str, data: bytes) -> bool:
+    """Replace ``path`` by ``data`` through open_atomic(). Returns False, and
+    writes nothing, when the file already holds ``data``."""
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest():
+                    return False
+    except OSError:
+        pass
+
+    with open_atomic(path) as f:
+        f.write(data)
+    return True
+
+
+class _Unchanged(Exception):
+    """Aborts an open_atomic() block whose file would not change."""
+
+
+def write_chunks_atomic(path: str, chunks: Iterable[str]) -> Tuple[bool, str]:
+    """Stream the UTF-8 of ``chunks`` to ``path`` through open_atomic(), one
+    chunk at a time. Returns (written, sha256 hex); as write_atomic(), the
+    file is left alone when it already holds the same bytes."""
+    h = hashlib.sha256()
+    try:
+        old = open(path, "rb")
+    except OSError:
+        old = None
+    try:
+        same = old is not None
+        with open_atomic(path) as f:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                h.update(data)
+                if same:
+                    same = old.read(len(data)) == data
+                f.write(data)
+            if same and not old.read(1):
+                raise _Unchanged
+    except _Unchanged:
+        return False, h.hexdigest()
+    finally:
+        if old is not None:
+            old.close()
+    return True, h.hexdigest()
+
+
+class OutputWriter:
+    """write_atomic() on a thread pool, for writing independent files at once."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._pool = ThreadPoolExecutor(max_workers or min(8, os.cpu_count() or 1))
+
+    def submit(self, path: str, text: str) -> "Future[bool]":
+        return self.submit_bytes(path, text.encode("utf-8"))
+
+    def submit_bytes(self, path: str, data: bytes) -> "Future[bool]":
+        return self._pool.submit(write_atomic, path, data)
+
+    def submit_chunks(self, path: str, chunks: Callable[[], Iterable[str]]) -> "Future[Tuple[bool, str]]":
+        """write_chunks_atomic() of ``chunks()``, produced on the writer thread."""
+        return self._pool.submit(lambda: write_chunks_atomic(path, chunks()))
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
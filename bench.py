@@ -0,0 +1,126 @@
+"""Micro benchmarks for the catalog lookup and export paths.
+
+python3 bench.py [name ...]
+"""
+
+import sys
+import timeit
+
+from books_matn import JSON_BACKENDS, FilenameHash, books_json, books_to_dicts, get_catalog, set_json_backend
+from paliscriptconverter import SCRIPTS, convert, convert_many
+
+
+def _report(label, seconds, number):
+    print(f"  {label:<28} {seconds / number * 1e6:10.1f} µs/call")
+
+
+def bench_lookup(number=2000):
+    """Jump targets for every catalog filename: per item vs batch."""
+    catalog = get_catalog()
+    names = list(catalog.table.file_name) * 2  # ~430 filenames, as on a result page
+
+    def per_item():
+        out = {}
+        for name in names:
+            book = catalog.books_by_file.get(name)
+            if book is None:
+                out[name] = None
+                continue
+            d = book.to_dict()
+            y = ""
+            for field, key in (("MulaIndex", "m"), ("AtthakathaIndex", "a"), ("TikaIndex", "t")):
+                index = d[field]
+                if index is not None and index < len(catalog.books):
+                    d[key] = catalog.books[index].FileName
+                    y += key
+            d["y"] = y
+            out[name] = d
+        return out
+
+    print(f"lookup: {len(names)} filenames")
+    _report("per item (to_dict)", timeit.timeit(per_item, number=number), number)
+    _report("resolve_many", timeit.timeit(lambda: catalog.resolve_many(names), number=number), number)
+    _report(
+        "resolve_many_json",
+        timeit.timeit(lambda: catalog.resolve_many_json(names), number=number),
+        number,
+    )
+
+
+def bench_filename_hash(number=2000):
+    """Filename -> row id for every catalog filename: dict vs FilenameHash."""
+    table = get_catalog().table
+    names = list(table.file_name)
+    index = FilenameHash.build(table.file_name)
+    get_row = table.row_by_file.get
+
+    print(f"filename -> row: {len(names)} filenames")
+    _report("row_by_file.get", timeit.timeit(lambda: [get_row(name) for name in names], number=number), number)
+    _report("FilenameHash.lookup", timeit.timeit(lambda: [index.lookup(name) for name in names], number=number), number)
+
+
+def bench_transliterate(number=20):
+    """Every nav path HI -> each script: per call vs batch."""
+    table = get_catalog().table
+    paths = [p for column in (table.long_nav_path, table.short_nav_path) for p in column if p]
+
+    def per_call():
+        return [convert(path, "HI", script) for script in SCRIPTS for path in paths]
+
+    def batch():
+        return [convert_many(paths, "HI", script) for script in SCRIPTS]
+
+    print(f"transliterate: {len(paths)} nav paths x {len(SCRIPTS)} scripts")
+    _report("convert", timeit.timeit(per_call, number=number), number)
+    _report("convert_many", timeit.timeit(batch, number=number), number)
+
+
+def bench_json(number=50):
+    """Full catalog books JSON, pretty and minified: to_dict + stdlib json vs
+    each backend, and the BookEncoder fast path (which only uses the
+    backend's string encoder, the same C function for both)."""
+    import json
+
+    catalog = get_catalog()
+    print(f"json: {len(catalog.books)} books")
+    for pretty in (True, False):
+        mode = "pretty" if pretty else "min"
+        options = {"indent": 2} if pretty else {"separators": (",", ":")}
+        _report(
+            f"{mode} to_dict + json.dumps",
+            timeit.timeit(
+                lambda: json.dumps(books_to_dicts(catalog.books), ensure_ascii=False, **options),
+                number=number,
+            ),
+            number,
+        )
+        for name in JSON_BACKENDS:
+            try:
+                backend = set_json_backend(name)
+            except ImportError:
+                print(f"  {name}: not installed")
+                continue
+            _report(
+                f"{mode} to_dict + {name}",
+                timeit.timeit(lambda: backend.dumps(books_to_dicts(catalog.books), pretty), number=number),
+                number,
+            )
+        set_json_backend(None)
+        _report(
+            f"{mode} BookEncoder",
+            timeit.timeit(lambda: books_json(catalog.table, pretty), number=number),
+            number,
+        )
+
+
+BENCHMARKS = {
+    "lookup": bench_lookup,
+    "filename_hash": bench_filename_hash,
+    "transliterate": bench_transliterate,
+    "json": bench_json,
+}
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -0,0 +1,227 @@
+"""Generate books_matn.tsv from the C# Books.cs
+
+Books.cs: https://github.com/tipitakapali/vri_cst/blob/main/src/CST/Books.cs
+
+python3 books_cs.py path/to/vri_cst/src/CST/Books.cs
+"""
+
+import os
+import re
+import sys
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from atomic_write import open_atomic, write_atomic
+from books_matn import CATALOG_COLUMNS, CATALOG_FILE
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "books_cs")
+
+_INDEX_FIELDS = ("Index", "MulaIndex", "AtthakathaIndex", "TikaIndex")
+_ENUM_FIELDS = {"Matn": "CommentaryLevel", "Pitaka": "Pitaka", "BookType": "BookType"}
+
+_TOKEN = re.compile(
+    r"""
+      (?P<space>\s+)
+    | (?P<comment>//[^\n]*)
+    | (?P<block>/\*.*?\*/)
+    | (?P<vstring>@"(?:[^"]|"")*")
+    | (?P<string>"(?:[^"\\\n]|\\.)*")
+    | (?P<number>\d+)
+    | (?P<name>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)
+    | (?P<op>\+\+|--|[-+*=;(){},\[\]<>!.&|?:])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# "12 + 13 + 14", "50 - 60": Multi/Split notes kept in the relation cell
+_COVER_NOTE = re.compile(r"^\d+(?: [+-] \d+)+$")
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "0": "\0", '"': '"', "'": "'", "\\": "\\"}
+
+
+def _unescape(literal: str) -> str:
+    if literal.startswith("@"):
+        return literal[2:-1].replace('""', '"')
+
+    def escape(m):
+        code = m.group(1)
+        return chr(int(code[1:], 16)) if len(code) == 5 else _ESCAPES.get(code, code)
+
+    return re.sub(r"\\(u[0-9a-fA-F]{4}|.)", escape, literal[1:-1])
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Tuple[str, str, bool]]:
+    """Yield (kind, text, starts_line) tokens, one source line at a time.
+
+    ``starts_line`` tells a comment on its own line from a trailing one.
+    Block comments and verbatim strings may span lines.
+    """
+    pending = ""
+    for line in lines:
+        text = pending + line
+        pending = ""
+        pos = 0
+        first = True
+        while pos < len(text):
+            m = _TOKEN.match(text, pos)
+            if m is None:
+                rest = text[pos:]
+                if rest.startswith(("/*", '@"')):
+                    pending = rest  # continues on the next line
+                    break
+                raise ValueError(f"Books.cs: unexpected input {rest[:40]!r}")
+            kind = m.lastgroup
+            if kind != "space":
+                yield kind, m.group(), first
+                first = False
+            pos = m.end()
+    if pending:
+        raise ValueError("Books.cs: unterminated comment or string")
+
+
+def _statements(tokens: Iterator[Tuple[str, str, bool]]):
+    """Group tokens into ``;``-terminated statements with their comments."""
+    statement: List[Tuple[str, str]] = []
+    for kind, text, starts_line in tokens:
+        if kind == "block":
+            continue
+        if kind == "comment":
+            yield ("comment" if starts_line else "trailing"), text[2:].strip()
+            continue
+        if text in (";", "{", "}"):
+            if statement:
+                yield "statement", statement
+            statement = []
+        else:
+            statement.append((kind, text))
+
+
+def _evaluate(expr: List[Tuple[str, str]], book: Dict[str, str], field: str) -> str:
+    if not expr:
+        raise ValueError(f"Books.cs: empty value for {field}")
+
+    if field in _ENUM_FIELDS:
+        (kind, text), = expr
+        enum, _, member = text.rpartition(".")
+        if kind != "name" or enum != _ENUM_FIELDS[field]:
+            raise ValueError(f"Books.cs: {field} = {text}")
+        return member
+
+    # strings, "a" + "b" and references to other fields of the same book
+    # integers with + / - arithmetic
+    total: Optional[int] = None
+    parts: List[str] = []
+    sign = 1
+    for kind, text in expr:
+        if kind == "op" and text in "+-":
+            sign = -1 if text == "-" else 1
+            continue
+        if kind in ("string", "vstring"):
+            parts.append(_unescape(text))
+        elif kind == "number":
+            total = (total or 0) + sign * int(text)
+        elif kind == "name" and text.startswith("book."):
+            value = book[text[5:]]
+            if field in _INDEX_FIELDS:
+                total = (total or 0) + sign * int(value.split(None, 1)[0])
+            else:
+                parts.append(value)
+        else:
+            raise ValueError(f"Books.cs: cannot evaluate {field} = {text}")
+        sign = 1
+    return str(total) if total is not None else "".join(parts)
+
+
+def parse_books(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """Yield one catalog row (column -> cell) per ``book = new Book()`` block."""
+    book: Optional[Dict[str, str]] = None
+    notes: List[str] = []
+    last_field: Optional[str] = None
+    count = 0
+
+    for kind, value in _statements(tokenize(lines)):
+        if kind == "comment":
+            notes.append(value)
+            continue
+        if kind == "trailing":
+            if book is not None and last_field in _INDEX_FIELDS[1:] and _COVER_NOTE.match(value):
+                if value.split(None, 1)[0] == book[last_field]:
+                    book[last_field] = value
+                    continue
+            notes.append(value)
+            continue
+
+        texts = [text for _, text in value]
+        if texts[:4] == ["book", "=", "new", "Book"]:
+            # comments just above the block belong to it
+            book = dict.fromkeys(CATALOG_COLUMNS, "")
+            book["Index"] = str(count)
+            last_field = None
+            continue
+        if book is None:
+            notes.clear()
+            continue
+
+        if len(value) >= 2 and value[0][1].startswith("book.") and value[1][1] == "=":
+            last_field = value[0][1][5:]
+            if last_field in book and last_field != "Note":
+                book[last_field] = _evaluate(value[2:], book, last_field)
+        elif texts and texts[0].endswith(".Add") and texts[-2:] == ["book", ")"]:
+            book["Note"] = "; ".join(notes)
+            for column, cell in book.items():
+                if "\t" in cell or "\n" in cell:
+                    raise ValueError(f"Books.cs: tab or newline in {column} of {book['FileName']}")
+            yield book
+            count += 1
+            book = None
+            notes = []
+
+
+def write_catalog(rows: Iterable[Dict[str, str]], catalog_file: str = CATALOG_FILE) -> int:
+    """Write ``rows`` to ``catalog_file`` through open_atomic(), so a parse
+    error leaves neither a partial catalog nor a temp file behind."""
+    count = 0
+    with open_atomic(catalog_file, "w", encoding="utf-8", newline="\n") as f:
+        f.write("\t".join(CATALOG_COLUMNS) + "\n")
+        for row in rows:
+            f.write("\t".join(row[column] for column in CATALOG_COLUMNS) + "\n")
+            count += 1
+    return count
+
+
+def file_digest(*paths: str) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+def refresh_catalog(
+    books_cs: str, catalog_file: str = CATALOG_FILE, cache_dir: str = CACHE_DIR
+) -> bool:
+    """Regenerate ``catalog_file`` from Books.cs; returns True if it changed.
+
+    Parsed tables are cached under the SHA-256 of Books.cs and of this parser,
+    so an unchanged source is never parsed twice and a parser fix is never
+    hidden by a table cached before it.
+    """
+    cached = os.path.join(cache_dir, file_digest(books_cs, os.path.abspath(__file__)) + ".tsv")
+    if not os.path.exists(cached):
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(books_cs, "r", encoding="utf-8-sig") as f:
+            count = write_catalog(parse_books(f), cached)
+        print(f"Parsed {count} books from {books_cs}")
+
+    with open(cached, "rb") as f:
+        data = f.read()
+    if not write_atomic(catalog_file, data):
+        return False
+    print(f"Updated {catalog_file}")
+    return True
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit(__doc__)
+    refresh_catalog(sys.argv[1])
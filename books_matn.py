@@ -1,12 +1,25 @@
 """VRI MATN mapping"""
 
 import os
+import sys
 import json
+import zlib
+import threading
+from array import array
+from bisect import bisect_right
 from enum import Enum
-from typing import List, Dict
+from types import MappingProxyType
+from typing import IO, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
 
 output_dir = "output"
-os.makedirs(output_dir, exist_ok=True)
+
+# Books.cs: https://github.com/tipitakapali/vri_cst/blob/main/src/CST/Books.cs
+# One book per line, tab separated, in Books.cs order.
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "books_matn.tsv")
+CATALOG_COLUMNS = (
+    "Index", "FileName", "LongNavPath", "ShortNavPath", "Matn", "Pitaka", "BookType",
+    "MulaIndex", "AtthakathaIndex", "TikaIndex", "ChapterListTypes", "Note",
+)
 
 
 class Pitaka(Enum):
@@ -37,6 +50,111 @@ class EnumEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+class JsonBackend:
+    """stdlib json in the layout of the outputs: ``pretty`` is indent=2,
+    otherwise (",", ":") separators, and non-ASCII is kept. Enum members
+    (Pitaka, CommentaryLevel, BookType) are written by name."""
+
+    name = "json"
+
+    def dumps(self, obj, pretty: bool = False) -> str:
+        if pretty:
+            return json.dumps(obj, indent=2, ensure_ascii=False, cls=EnumEncoder)
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, cls=EnumEncoder)
+
+    def loads(self, text: Union[str, bytes]):
+        return json.loads(text)
+
+    # one string literal; the C encoder beats a per-string orjson call
+    string = staticmethod(json.encoder.encode_basestring)
+
+
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+def _enum_names(obj):
+    """``obj`` with every Enum member replaced by its name, as EnumEncoder
+    writes it (orjson would write the value)."""
+    kind = type(obj)
+    if kind is dict:
+        return {key: value if type(value) in _SCALARS else _enum_names(value) for key, value in obj.items()}
+    if kind is list or kind is tuple:
+        return [value if type(value) in _SCALARS else _enum_names(value) for value in obj]
+    if isinstance(obj, Enum):
+        return obj.name
+    if isinstance(obj, dict):
+        return {key: _enum_names(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_enum_names(value) for value in obj]
+    return obj
+
+
+class OrjsonBackend(JsonBackend):
+    """orjson, byte-identical to JsonBackend: Enum members are turned into
+    their names first, and what orjson refuses (e.g. ints over 64 bits)
+    takes the stdlib path."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj, pretty: bool = False) -> str:
+        try:
+            return self._orjson.dumps(
+                _enum_names(obj), default=self._default, option=self._orjson.OPT_INDENT_2 if pretty else 0
+            ).decode("utf-8")
+        except self._orjson.JSONEncodeError:
+            return super().dumps(obj, pretty)
+
+    @staticmethod
+    def _default(obj):
+        raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+    def loads(self, text: Union[str, bytes]):
+        return self._orjson.loads(text)
+
+
+JSON_BACKENDS = {"json": JsonBackend, "orjson": OrjsonBackend}
+_json_backend: Optional[JsonBackend] = None
+
+
+class JsonBackendError(ValueError):
+    """A backend name (``$BOOKS_MATN_JSON``) that is not in JSON_BACKENDS."""
+
+
+def _new_json_backend(name: str) -> JsonBackend:
+    try:
+        backend = JSON_BACKENDS[name]
+    except KeyError:
+        raise JsonBackendError(f"unknown JSON backend {name!r}; choose one of {', '.join(JSON_BACKENDS)}") from None
+    return backend()
+
+
+def get_json_backend() -> JsonBackend:
+    """The backend named by $BOOKS_MATN_JSON, else orjson when installed, else json."""
+    global _json_backend
+    if _json_backend is None:
+        name = os.environ.get("BOOKS_MATN_JSON")
+        if name:
+            _json_backend = _new_json_backend(name)
+        else:
+            try:
+                _json_backend = OrjsonBackend()
+            except ImportError:
+                _json_backend = JsonBackend()
+    return _json_backend
+
+
+def set_json_backend(name: Optional[str]) -> JsonBackend:
+    """Switch to backend ``name``; None goes back to the default choice."""
+    global _json_backend
+    _json_backend = _new_json_backend(name) if name else None
+    return get_json_backend()
+
+
 class Book:
     def __init__(self):
         self.Index: int = 0
@@ -67,2726 +185,1239 @@ class Book:
         }
 
 
-def populate_book_list() -> tuple[List[Book], Dict[str, Book]]:
+def _parse_index(cell: str) -> Optional[int]:
+    # Relation cells keep the Books.cs annotation, e.g. "12 + 13 + 14" or "50 - 60";
+    # the first number is the index Books.cs assigns.
+    if not cell:
+        return None
+    return int(cell.split(None, 1)[0])
+
+
+def _parse_cover(cell: str) -> Tuple[int, ...]:
+    """Every index a relation cell names: "12 + 13 + 14", "50 - 60" or "12"."""
+    if " - " in cell:
+        first, last = cell.split(" - ")
+        return tuple(range(int(first), int(last) + 1))
+    return tuple(int(part) for part in cell.split(" + "))
+
+
+class CatalogError(ValueError):
+    """Every problem found by the loaders or validate_catalog(), reported at once."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__(f"{len(errors)} catalog error(s):\n" + "\n".join(errors))
+        self.errors = errors
+
+
+def _read_catalog(catalog_file: str, columns: Tuple[str, ...] = CATALOG_COLUMNS) -> List[Tuple[str, List[str]]]:
+    """("<file>:<line>", cells) per row; the trailing Note may be left out.
+    A row with another number of cells is a CatalogError."""
+    name = os.path.basename(catalog_file)
+    rows, errors = [], []
+    with open(catalog_file, "r", encoding="utf-8") as f:
+        next(f)  # header
+        for line_no, line in enumerate(f, 2):
+            label = f"{name}:{line_no}"
+            cells = line.rstrip("\n").split("\t")
+            if len(cells) == len(columns) - 1:
+                cells.append("")
+            if len(cells) != len(columns):
+                errors.append(f"{label}: {len(cells)} cells, expected {len(columns)} ({', '.join(columns)})")
+                continue
+            rows.append((label, cells))
+    if errors:
+        raise CatalogError(errors)
+    return rows
+
+
+def _member(enum, cell: str, column: str, label: str, errors: List[str]):
+    """The ``enum`` member named ``cell``, None for an empty cell; an unknown
+    name is added to ``errors``."""
+    if not cell:
+        return None
+    member = enum.__members__.get(cell)
+    if member is None:
+        errors.append(f"{label}: unknown {column} {cell!r} (one of {', '.join(enum.__members__)})")
+    return member
+
+
+def populate_book_list(
+    catalog_file: str = CATALOG_FILE,
+) -> tuple[List[Book], Dict[str, Book]]:
+    """Decode the catalog table (Books.cs order) into Book objects."""
     book_list: List[Book] = []
     books_by_file: Dict[str, Book] = {}
+    errors: List[str] = []
+
+    for label, (index, file_name, long_nav, short_nav, level, pit, btype,
+                mula, attha, tika, chapters, _note) in _read_catalog(catalog_file):
+        book = Book()
+        try:
+            book.Index = int(index)
+            book.MulaIndex = _parse_index(mula)
+            book.AtthakathaIndex = _parse_index(attha)
+            book.TikaIndex = _parse_index(tika)
+        except ValueError as e:
+            errors.append(f"{label}: {e}")
+            continue
+        book.FileName = file_name
+        book.LongNavPath = long_nav
+        book.ShortNavPath = short_nav
+        book.Matn = _member(CommentaryLevel, level, "Matn", label, errors)
+        book.Pitaka = _member(Pitaka, pit, "Pitaka", label, errors)
+        if btype:
+            book.BookType = _member(BookType, btype, "BookType", label, errors)
+        book.ChapterListTypes = chapters or None
+        book_list.append(book)
+        books_by_file[file_name] = book
+
+    if errors:
+        raise CatalogError(errors)
+    return book_list, books_by_file
 
-    # Books.cs: https://github.com/tipitakapali/vri_cst/blob/main/src/CST/Books.cs
-    book = Book()
-    book.Index = 0
-    book.FileName = "s0101m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/दीघ निकाय/सीलक्खन्धवग्गपाळि"
-    book.ShortNavPath = "सु॰ पि॰/दी॰ नि॰/सीलक्खन्धवग्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 61
-    book.TikaIndex = 108
-    book.ChapterListTypes = "book,sutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 1
-    book.FileName = "s0102m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/दीघ निकाय/महावग्गपाळि"
-    book.ShortNavPath = "सु॰ पि॰/दी॰ नि॰/महावग्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 62
-    book.TikaIndex = 109
-    book.ChapterListTypes = "book,sutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 2
-    book.FileName = "s0103m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/दीघ निकाय/पाथिकवग्गपाळि"
-    book.ShortNavPath = "सु॰ पि॰/दी॰ नि॰/पाथिकवग्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 63
-    book.TikaIndex = 110
-    book.ChapterListTypes = "book,sutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 3
-    book.FileName = "s0201m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/मज्झिम निकाय/मूलपण्णासपाळि"
-    book.ShortNavPath = "सु॰ पि॰/म॰ नि॰/मूलपण्णासपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 64
-    book.TikaIndex = 113
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 4
-    book.FileName = "s0202m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/मज्झिम निकाय/मज्झिमपण्णासपाळि"
-    book.ShortNavPath = "सु॰ पि॰/म॰ नि॰/मज्झिमपण्णासपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 65
-    book.TikaIndex = 114
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 5
-    book.FileName = "s0203m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/मज्झिम निकाय/उपरिपण्णासपाळि"
-    book.ShortNavPath = "सु॰ पि॰/म॰ नि॰/उपरिपण्णासपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 66
-    book.TikaIndex = 115
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 6
-    book.FileName = "s0301m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/संयुत्त निकाय/सगाथावग्गपाळि"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/सगाथावग्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 67
-    book.TikaIndex = 116
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 7
-    book.FileName = "s0302m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/संयुत्त निकाय/निदानवग्गपाळि"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/निदानवग्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 68
-    book.TikaIndex = 117
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 8
-    book.FileName = "s0303m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/संयुत्त निकाय/खन्धवग्गपाळि"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/खन्धवग्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 69
-    book.TikaIndex = 118
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 9
-    book.FileName = "s0304m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/संयुत्त निकाय/सळायतनवग्गपाळि"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/सळायतनवग्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 70
-    book.TikaIndex = 119
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 10
-    book.FileName = "s0305m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/संयुत्त निकाय/महावग्गपाळि"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/महावग्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 71
-    book.TikaIndex = 120
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 11
-    book.FileName = "s0401m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/अङ्गुत्तर निकाय/एककनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/एककनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 72
-    book.TikaIndex = 121
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 12
-    book.FileName = "s0402m1.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/अङ्गुत्तर निकाय/दुकनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/दुकनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 73
-    book.TikaIndex = 122
-    book.ChapterListTypes = "book,pannasaka,vagga,peyyala"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 13
-    book.FileName = "s0402m2.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/अङ्गुत्तर निकाय/तिकनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/तिकनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 73
-    book.TikaIndex = 122
-    book.ChapterListTypes = "book,pannasaka,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 14
-    book.FileName = "s0402m3.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/अङ्गुत्तर निकाय/चतुक्कनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/चतुक्कनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 73
-    book.TikaIndex = 122
-    book.ChapterListTypes = "book,pannasaka,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 15
-    book.FileName = "s0403m1.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/अङ्गुत्तर निकाय/पञ्चकनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/पञ्चकनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 74
-    book.TikaIndex = 123
-    book.ChapterListTypes = "book,pannasaka,vagga,peyyala"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 16
-    book.FileName = "s0403m2.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/अङ्गुत्तर निकाय/छक्कनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/छक्कनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 74
-    book.TikaIndex = 123
-    book.ChapterListTypes = "book,pannasaka,vagga,peyyala"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 17
-    book.FileName = "s0403m3.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/अङ्गुत्तर निकाय/सत्तकनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/सत्तकनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 74
-    book.TikaIndex = 123
-    book.ChapterListTypes = "book,pannasaka,vagga,peyyala"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 18
-    book.FileName = "s0404m1.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/अङ्गुत्तर निकाय/अट्ठकनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/अट्ठकनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 75
-    book.TikaIndex = 124
-    book.ChapterListTypes = "book,pannasaka,vagga,peyyala"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 19
-    book.FileName = "s0404m2.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/अङ्गुत्तर निकाय/नवकनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/नवकनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 75
-    book.TikaIndex = 124
-    book.ChapterListTypes = "book,pannasaka,vagga,peyyala"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 20
-    book.FileName = "s0404m3.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/अङ्गुत्तर निकाय/दसकनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/दसकनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 75
-    book.TikaIndex = 124
-    book.ChapterListTypes = "book,pannasaka,vagga,peyyala"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 21
-    book.FileName = "s0404m4.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/अङ्गुत्तर निकाय/एकादसकनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/एकादसकनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 75
-    book.TikaIndex = 124
-    book.ChapterListTypes = "book,vagga,peyyala"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 22
-    book.FileName = "s0501m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/खुद्दकपाठपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/खुद्दकपाठपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 76
-    book.ChapterListTypes = "book,chapter"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 23
-    book.FileName = "s0502m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/धम्मपदपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/धम्मपदपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 77
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 24
-    book.FileName = "s0503m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/उदानपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/उदानपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 78
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 25
-    book.FileName = "s0504m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/इतिवुत्तकपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/इतिवुत्तकपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 79
-    book.ChapterListTypes = "book,nipata"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 26
-    book.FileName = "s0505m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/सुत्तनिपातपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/सुत्तनिपातपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 80
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 27
-    book.FileName = "s0506m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/विमानवत्थुपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/विमानवत्थुपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 81
-    book.ChapterListTypes = "book,vimana"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 28
-    book.FileName = "s0507m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/पेतवत्थुपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/पेतवत्थुपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 82
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 29
-    book.FileName = "s0508m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/थेरगाथापाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/थेरगाथापाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 83  # 83 + 84
-    book.ChapterListTypes = "book,nipata"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 30
-    book.FileName = "s0509m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/थेरीगाथापाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/थेरीगाथापाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 85
-    book.ChapterListTypes = "book,nipata"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 31
-    book.FileName = "s0510m1.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/अपदानपाळि-१"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/अपदानपाळि-१"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Split
-    book.AtthakathaIndex = 86
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 32
-    book.FileName = "s0510m2.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/अपदानपाळि-२"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/अपदानपाळि-२"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Split
-    book.AtthakathaIndex = 86
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 33
-    book.FileName = "s0511m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/बुद्धवंसपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/बुद्धवंसपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 87
-    book.ChapterListTypes = "book,chapter"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 34
-    book.FileName = "s0512m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/चरियापिटकपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/चरियापिटकपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 88
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 35
-    book.FileName = "s0513m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/जातकपाळि-१"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/जातकपाळि-१"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 89  # 89 + 90 + 91 + 92
-    book.ChapterListTypes = "book,nipata"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 36
-    book.FileName = "s0514m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/जातकपाळि-२"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/जातकपाळि-२"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 93  # 93 + 94 + 95
-    book.ChapterListTypes = "book,nipata"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 37
-    book.FileName = "s0515m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/महानिद्देसपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/महानिद्देसपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 96
-    book.ChapterListTypes = "book,chapter"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 38
-    book.FileName = "s0516m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/चूळनिद्देसपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/चूळनिद्देसपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 97
-    book.ChapterListTypes = "book,chapter"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 39
-    book.FileName = "s0517m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/पटिसम्भिदामग्गपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/पटिसम्भिदामग्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 98
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 40
-    book.FileName = "s0519m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/नेत्तिप्पकरणपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/नेत्तिप्पकरणपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 99
-    book.ChapterListTypes = "book,chapter"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 41
-    book.FileName = "s0518m.nrf.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/मिलिन्दपञ्हपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/मिलिन्दपञ्हपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    # unlinked
-    book.ChapterListTypes = "book,chapter"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 42
-    book.FileName = "s0520m.nrf.xml"
-    book.LongNavPath = "तिपिटक (मूल)/सुत्त पिटक/खुद्दक निकाय/पेटकोपदेसपाळि"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/पेटकोपदेसपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Sutta
-    # unlinked
-    book.ChapterListTypes = "book,chapter"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 43
-    book.FileName = "vin01m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/विनय पिटक/पाराजिकपाळि"
-    book.ShortNavPath = "वि॰ पि॰/पाराजिकपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 100
-    book.TikaIndex = 127  # 127 + 128
-    book.ChapterListTypes = "book,kanda"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 44
-    book.FileName = "vin02m1.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/विनय पिटक/पाचित्तियपाळि"
-    book.ShortNavPath = "वि॰ पि॰/पाचित्तियपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 101
-    book.TikaIndex = 129
-    book.ChapterListTypes = "book,subbook,kanda"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 45
-    book.FileName = "vin02m2.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/विनय पिटक/महावग्गपाळि"
-    book.ShortNavPath = "वि॰ पि॰/महावग्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 102
-    book.TikaIndex = 129
-    book.ChapterListTypes = "book,khandaka"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 46
-    book.FileName = "vin02m3.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/विनय पिटक/चूळवग्गपाळि"
-    book.ShortNavPath = "वि॰ पि॰/चूळवग्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 103
-    book.TikaIndex = 129
-    book.ChapterListTypes = "book,khandaka"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 47
-    book.FileName = "vin02m4.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/विनय पिटक/परिवारपाळि"
-    book.ShortNavPath = "वि॰ पि॰/परिवारपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Whole
-    book.AtthakathaIndex = 104
-    book.TikaIndex = 129
-    book.ChapterListTypes = "book,chapter"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 48
-    book.FileName = "abh01m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/धम्मसङ्गणीपाळि"
-    book.ShortNavPath = "अभि॰ पि॰/धम्मसङ्गणीपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 105
-    book.ChapterListTypes = "book,chapter"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 49
-    book.FileName = "abh02m.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/विभङ्गपाळि"
-    book.ShortNavPath = "अभि॰ पि॰/विभङ्गपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 106
-    book.TikaIndex = 141
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 50
-    book.FileName = "abh03m1.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/धातुकथापाळि"
-    book.ShortNavPath = "अभि॰ पि॰/धातुकथापाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 107
-    book.TikaIndex = 142
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 51
-    book.FileName = "abh03m2.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/पुग्गलपञ्ञत्तिपाळि"
-    book.ShortNavPath = "अभि॰ पि॰/पुग्गलपञ्ञत्तिपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 107
-    book.TikaIndex = 142
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 52
-    book.FileName = "abh03m3.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/कथावत्थुपाळि"
-    book.ShortNavPath = "अभि॰ पि॰/कथावत्थुपाळि"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 107
-    book.TikaIndex = 99999
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 53
-    book.FileName = "abh03m4.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/यमकपाळि-१"
-    book.ShortNavPath = "अभि॰ पि॰/यमकपाळि-१"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 107
-    book.TikaIndex = 142
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 54
-    book.FileName = "abh03m5.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/यमकपाळि-२"
-    book.ShortNavPath = "अभि॰ पि॰/यमकपाळि-२"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 107
-    book.TikaIndex = 142
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 55
-    book.FileName = "abh03m6.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/यमकपाळि-३"
-    book.ShortNavPath = "अभि॰ पि॰/यमकपाळि-३"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 107
-    book.TikaIndex = 142
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 56
-    book.FileName = "abh03m7.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/पट्ठानपाळि-१"
-    book.ShortNavPath = "अभि॰ पि॰/पट्ठानपाळि-१"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 107
-    book.TikaIndex = 99999
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 57
-    book.FileName = "abh03m8.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/पट्ठानपाळि-२"
-    book.ShortNavPath = "अभि॰ पि॰/पट्ठानपाळि-२"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 107
-    book.TikaIndex = 142
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 58
-    book.FileName = "abh03m9.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/पट्ठानपाळि-३"
-    book.ShortNavPath = "अभि॰ पि॰/पट्ठानपाळि-३"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 107
-    book.TikaIndex = 142
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 59
-    book.FileName = "abh03m10.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/पट्ठानपाळि-४"
-    book.ShortNavPath = "अभि॰ पि॰/पट्ठानपाळि-४"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 107
-    book.TikaIndex = 99999
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 60
-    book.FileName = "abh03m11.mul.xml"
-    book.LongNavPath = "तिपिटक (मूल)/अभिधम्म पिटक/पट्ठानपाळि-५"
-    book.ShortNavPath = "अभि॰ पि॰/पट्ठानपाळि-५"
-    book.Matn = CommentaryLevel.Mula
-    book.Pitaka = Pitaka.Abhidhamma
-    book.AtthakathaIndex = 107
-    book.TikaIndex = 142
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 61
-    book.FileName = "s0101a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/दीघ निकाय (अट्ठकथा)/सीलक्खन्धवग्ग-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/दी॰ नि॰/सीलक्खन्धवग्ग-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 0
-    book.TikaIndex = 108
-    book.ChapterListTypes = "book,sutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 62
-    book.FileName = "s0102a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/दीघ निकाय (अट्ठकथा)/महावग्ग-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/दी॰ नि॰/महावग्ग-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 1
-    book.TikaIndex = 109
-    book.ChapterListTypes = "book,sutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 63
-    book.FileName = "s0103a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/दीघ निकाय (अट्ठकथा)/पाथिकवग्ग-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/दी॰ नि॰/पाथिकवग्ग-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 2
-    book.TikaIndex = 110
-    book.ChapterListTypes = "book,sutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 64
-    book.FileName = "s0201a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/मज्झिम निकाय (अट्ठकथा)/मूलपण्णास-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/म॰ नि॰/मूलपण्णास-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 3
-    book.TikaIndex = 113
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 65
-    book.FileName = "s0202a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/मज्झिम निकाय (अट्ठकथा)/मज्झिमपण्णास-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/म॰ नि॰/मज्झिमपण्णास-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 4
-    book.TikaIndex = 114
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 66
-    book.FileName = "s0203a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/मज्झिम निकाय (अट्ठकथा)/उपरिपण्णास-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/म॰ नि॰/उपरिपण्णास-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 5
-    book.TikaIndex = 115
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 67
-    book.FileName = "s0301a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/संयुत्त निकाय (अट्ठकथा)/सगाथावग्ग-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/सगाथावग्ग-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 6
-    book.TikaIndex = 116
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 68
-    book.FileName = "s0302a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/संयुत्त निकाय (अट्ठकथा)/निदानवग्ग-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/निदानवग्ग-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 7
-    book.TikaIndex = 117
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 69
-    book.FileName = "s0303a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/संयुत्त निकाय (अट्ठकथा)/खन्धवग्ग-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/खन्धवग्ग-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 8
-    book.TikaIndex = 118
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 70
-    book.FileName = "s0304a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/संयुत्त निकाय (अट्ठकथा)/सळायतनवग्ग-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/सळायतनवग्ग-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 9
-    book.TikaIndex = 119
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 71
-    book.FileName = "s0305a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/संयुत्त निकाय (अट्ठकथा)/महावग्ग-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/महावग्ग-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 10
-    book.TikaIndex = 120
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 72
-    book.FileName = "s0401a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/अङ्गुत्तर निकाय (अट्ठकथा)/एककनिपात-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/एककनिपात-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 11
-    book.TikaIndex = 121
-    book.ChapterListTypes = "book,intro,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 73
-    book.FileName = "s0402a.att.xml"
-    book.LongNavPath = (
-        "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/अङ्गुत्तर निकाय (अट्ठकथा)/दुक-तिक-चतुक्कनिपात-अट्ठकथा"
-    )
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/दुक-तिक-चतुक्कनिपात-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Multi
-    book.MulaIndex = 12  # 12 + 13 + 14
-    book.TikaIndex = 122
-    book.ChapterListTypes = "book,pannasaka,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 74
-    book.FileName = "s0403a.att.xml"
-    book.LongNavPath = (
-        "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/अङ्गुत्तर निकाय (अट्ठकथा)/पञ्चक-छक्क-सत्तकनिपात-अट्ठकथा"
+
+# Enum columns are stored as uint8 codes: the member value, 0 for "not set".
+_MATN = (None, *CommentaryLevel)
+_PITAKA = (None, *Pitaka)
+_BOOK_TYPE = (None, *BookType)
+
+# Int columns use -1 for "not set".
+NO_INDEX = -1
+
+# Books.cs sets TikaIndex = 99999 on volumes that have no ṭīkā of their own
+NO_TIKA = 99999
+
+
+class BookTable:
+    """Columnar catalog: one array or tuple per Book field, one entry per row."""
+
+    __slots__ = (
+        "index", "file_name", "long_nav_path", "short_nav_path",
+        "matn", "pitaka", "book_type",
+        "mula_index", "atthakatha_index", "tika_index",
+        "chapter_list_types", "row_by_file", "covers",
     )
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/पञ्चक-छक्क-सत्तकनिपात-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Multi
-    book.MulaIndex = 15  # 15 + 16 + 17
-    book.TikaIndex = 123
-    book.ChapterListTypes = "book,pannasaka,vagga,peyyala"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 75
-    book.FileName = "s0404a.att.xml"
-    book.LongNavPath = (
-        "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/अङ्गुत्तर निकाय (अट्ठकथा)/अट्ठकादिनिपात-अट्ठकथा"
+
+    def __init__(self):
+        self.index = array("i")
+        self.file_name: Tuple[str, ...] = ()
+        self.long_nav_path: Tuple[str, ...] = ()
+        self.short_nav_path: Tuple[str, ...] = ()
+        self.matn = array("B")
+        self.pitaka = array("B")
+        self.book_type = array("B")
+        self.mula_index = array("i")
+        self.atthakatha_index = array("i")
+        self.tika_index = array("i")
+        self.chapter_list_types: Tuple[Optional[str], ...] = ()
+        self.row_by_file: Dict[str, int] = {}
+        # (row, CommentaryLevel value) -> indices, for Multi/Split cells only
+        self.covers: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+
+    @classmethod
+    def load(cls, catalog_file: str = CATALOG_FILE) -> "BookTable":
+        table = cls()
+        intern = sys.intern
+        file_names, long_navs, short_navs, chapter_types = [], [], [], []
+        errors: List[str] = []
+
+        for label, (index, file_name, long_nav, short_nav, level, pit, btype,
+                    mula, attha, tika, chapters, _note) in _read_catalog(catalog_file):
+            row = len(file_names)
+            links = (
+                (CommentaryLevel.Mula, table.mula_index, mula),
+                (CommentaryLevel.Atthakatha, table.atthakatha_index, attha),
+                (CommentaryLevel.Tika, table.tika_index, tika),
+            )
+            try:
+                index = int(index)
+                values = [_parse_index(cell) for _level, _column, cell in links]
+                covers = {link.value: _parse_cover(cell) for link, _column, cell in links if " " in cell}
+            except ValueError as e:
+                errors.append(f"{label}: {e}")
+                continue
+            matn = _member(CommentaryLevel, level, "Matn", label, errors)
+            pitaka = _member(Pitaka, pit, "Pitaka", label, errors)
+            book_type = _member(BookType, btype or "Unknown", "BookType", label, errors)
+
+            table.row_by_file[intern(file_name)] = row
+            file_names.append(intern(file_name))
+            long_navs.append(intern(long_nav))
+            short_navs.append(intern(short_nav))
+            chapter_types.append(intern(chapters) if chapters else None)
+            table.index.append(index)
+            table.matn.append(matn.value if matn else 0)
+            table.pitaka.append(pitaka.value if pitaka else 0)
+            table.book_type.append(book_type.value if book_type else BookType.Unknown.value)
+            for (_level, column, _cell), value in zip(links, values):
+                column.append(NO_INDEX if value is None else value)
+            for level, cover in covers.items():
+                table.covers[row, level] = cover
+
+        if errors:
+            raise CatalogError(errors)
+        table.file_name = tuple(file_names)
+        table.long_nav_path = tuple(long_navs)
+        table.short_nav_path = tuple(short_navs)
+        table.chapter_list_types = tuple(chapter_types)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.file_name)
+
+    def __getitem__(self, row: int) -> "BookRow":
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return BookRow(self, row)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield BookRow(self, row)
+
+    def get(self, file_name: str) -> Optional["BookRow"]:
+        row = self.row_by_file.get(file_name)
+        return None if row is None else BookRow(self, row)
+
+
+def _index_or_none(value: int) -> Optional[int]:
+    return None if value == NO_INDEX else value
+
+
+class BookRow:
+    """Read-only view of one BookTable row with the Book attribute names."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: BookTable, row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def Index(self) -> int:
+        return self._table.index[self._row]
+
+    @property
+    def FileName(self) -> str:
+        return self._table.file_name[self._row]
+
+    @property
+    def LongNavPath(self) -> str:
+        return self._table.long_nav_path[self._row]
+
+    @property
+    def ShortNavPath(self) -> str:
+        return self._table.short_nav_path[self._row]
+
+    @property
+    def Matn(self) -> Optional[CommentaryLevel]:
+        return _MATN[self._table.matn[self._row]]
+
+    @property
+    def Pitaka(self) -> Optional[Pitaka]:
+        return _PITAKA[self._table.pitaka[self._row]]
+
+    @property
+    def BookType(self) -> Optional[BookType]:
+        return _BOOK_TYPE[self._table.book_type[self._row]]
+
+    @property
+    def MulaIndex(self) -> Optional[int]:
+        return _index_or_none(self._table.mula_index[self._row])
+
+    @property
+    def AtthakathaIndex(self) -> Optional[int]:
+        return _index_or_none(self._table.atthakatha_index[self._row])
+
+    @property
+    def TikaIndex(self) -> Optional[int]:
+        return _index_or_none(self._table.tika_index[self._row])
+
+    @property
+    def ChapterListTypes(self) -> Optional[str]:
+        return self._table.chapter_list_types[self._row]
+
+    to_dict = Book.to_dict
+
+    def __eq__(self, other):
+        if isinstance(other, BookRow):
+            return self._table is other._table and self._row == other._row
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._table), self._row))
+
+    def __repr__(self):
+        return f"BookRow({self._row}, {self.FileName!r})"
+
+
+_BOOK_FIELDS = tuple(Book().to_dict())
+
+
+class BookEncoder:
+    """``Book.to_dict()`` JSON for BookTable rows, formatted straight from the
+    columns: Enum codes map to pre-encoded names, so no dict is built per
+    book. ``depth`` indents pretty records for nesting in an array."""
+
+    def __init__(self, table: BookTable, pretty: bool = True, backend: Optional[JsonBackend] = None, depth: int = 0):
+        self.table = table
+        self._string = (backend or get_json_backend()).string
+        if pretty:
+            pad = "\n" + "  " * depth
+            fields = ("," + pad + "  ").join(f'"{field}": %s' for field in _BOOK_FIELDS)
+            self._template = "{" + pad + "  " + fields + pad + "}"
+        else:
+            self._template = "{" + ",".join(f'"{field}":%s' for field in _BOOK_FIELDS) + "}"
+        self._matn = tuple("null" if e is None else self._string(e.name) for e in _MATN)
+        self._pitaka = tuple("null" if e is None else self._string(e.name) for e in _PITAKA)
+        self._book_type = tuple("null" if e is None else self._string(e.name) for e in _BOOK_TYPE)
+
+    def _optional(self, value) -> str:
+        return "null" if value is None else self._string(value)
+
+    def encode(self, row: int) -> str:
+        t = self.table
+        return self._template % (
+            t.index[row],
+            self._string(t.file_name[row]),
+            self._optional(t.long_nav_path[row]),
+            self._optional(t.short_nav_path[row]),
+            self._matn[t.matn[row]],
+            self._pitaka[t.pitaka[row]],
+            self._book_type[t.book_type[row]],
+            "null" if t.mula_index[row] == NO_INDEX else t.mula_index[row],
+            "null" if t.atthakatha_index[row] == NO_INDEX else t.atthakatha_index[row],
+            "null" if t.tika_index[row] == NO_INDEX else t.tika_index[row],
+            self._optional(t.chapter_list_types[row]),
+        )
+
+
+def iter_books_json(table: BookTable, pretty: bool = True) -> Iterator[str]:
+    """Chunks of the books JSON array, one book at a time."""
+    encoder = BookEncoder(table, pretty, depth=1 if pretty else 0)
+    n = len(table)
+    if not n:
+        yield "[]"
+        return
+    if pretty:
+        open_, sep, close = "[\n  ", ",\n  ", "\n]"
+    else:
+        open_, sep, close = "[", ",", "]"
+    for row in range(n):
+        yield (sep if row else open_) + encoder.encode(row)
+    yield close
+
+
+def books_json(table: BookTable, pretty: bool = True) -> str:
+    """The same text as ``json.dumps(books_to_dicts(table), indent=2, ensure_ascii=False)``
+    (or minified), without the dicts."""
+    return "".join(iter_books_json(table, pretty))
+
+
+def _link_columns(table: BookTable):
+    return (
+        (CommentaryLevel.Mula, table.mula_index),
+        (CommentaryLevel.Atthakatha, table.atthakatha_index),
+        (CommentaryLevel.Tika, table.tika_index),
     )
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/अट्ठकादिनिपात-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Multi
-    book.MulaIndex = 18  # 18 + 19 + 20 + 21
-    book.TikaIndex = 124
-    book.ChapterListTypes = "book,pannasaka,vagga,peyyala"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 76
-    book.FileName = "s0501a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/खुद्दकपाठ-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/खुद्दकपाठ-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 22
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 77
-    book.FileName = "s0502a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/धम्मपद-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/धम्मपद-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 23
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 78
-    book.FileName = "s0503a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/उदान-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/उदान-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 24
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 79
-    book.FileName = "s0504a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/इतिवुत्तक-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/इतिवुत्तक-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 25
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 80
-    book.FileName = "s0505a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/सुत्तनिपात-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/सुत्तनिपात-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 26
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 81
-    book.FileName = "s0506a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/विमानवत्थु-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/विमानवत्थु-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 27
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 82
-    book.FileName = "s0507a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/पेतवत्थु-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/पेतवत्थु-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 28
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 83
-    book.FileName = "s0508a1.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/थेरगाथा-अट्ठकथा-१"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/थेरगाथा-अट्ठकथा-१"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Split
-    book.MulaIndex = 29
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 84
-    book.FileName = "s0508a2.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/थेरगाथा-अट्ठकथा-२"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/थेरगाथा-अट्ठकथा-२"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Split
-    book.MulaIndex = 29
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 85
-    book.FileName = "s0509a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/थेरीगाथा-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/थेरीगाथा-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 30
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 86
-    book.FileName = "s0510a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/अपदान-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/अपदान-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 31  # 31 + 32
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 87
-    book.FileName = "s0511a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/बुद्धवंस-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/बुद्धवंस-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 33
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 88
-    book.FileName = "s0512a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/चरियापिटक-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/चरियापिटक-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 34
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 89
-    book.FileName = "s0513a1.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/जातक-अट्ठकथा-१"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/जातक-अट्ठकथा-१"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Split
-    book.MulaIndex = 35
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 90
-    book.FileName = "s0513a2.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/जातक-अट्ठकथा-२"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/जातक-अट्ठकथा-२"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Split
-    book.MulaIndex = 35
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 91
-    book.FileName = "s0513a3.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/जातक-अट्ठकथा-३"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/जातक-अट्ठकथा-३"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Split
-    book.MulaIndex = 35
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 92
-    book.FileName = "s0513a4.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/जातक-अट्ठकथा-४"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/जातक-अट्ठकथा-४"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Split
-    book.MulaIndex = 35
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 93
-    book.FileName = "s0514a1.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/जातक-अट्ठकथा-५"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/जातक-अट्ठकथा-५"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Split
-    book.MulaIndex = 36
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 94
-    book.FileName = "s0514a2.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/जातक-अट्ठकथा-६"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/जातक-अट्ठकथा-६"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Split
-    book.MulaIndex = 36
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 95
-    book.FileName = "s0514a3.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/जातक-अट्ठकथा-७"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/जातक-अट्ठकथा-७"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Split
-    book.MulaIndex = 36
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 96
-    book.FileName = "s0515a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/महानिद्देस-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/महानिद्देस-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 37
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 97
-    book.FileName = "s0516a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/चूळनिद्देस-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/चूळनिद्देस-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 38
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 98
-    book.FileName = "s0517a.att.xml"
-    book.LongNavPath = (
-        "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/पटिसम्भिदामग्ग-अट्ठकथा"
+
+
+# Jumps Books.cs does not record (manualMapping() in tpo_map.js), one per
+# line: FileName, Key (the tpo_map key "m", "a" or "t"), Target, Note
+OVERRIDES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "overrides.tsv")
+OVERRIDE_COLUMNS = ("FileName", "Key", "Target", "Note")
+_KEY_LEVEL = {"m": CommentaryLevel.Mula, "a": CommentaryLevel.Atthakatha, "t": CommentaryLevel.Tika}
+
+
+class Override(NamedTuple):
+    file_name: str
+    key: str
+    target: str
+    note: str = ""
+
+
+def load_overrides(overrides_file: str = OVERRIDES_FILE) -> Tuple[Override, ...]:
+    return tuple(Override(*cells) for _label, cells in _read_catalog(overrides_file, OVERRIDE_COLUMNS))
+
+
+def _override_rows(table: BookTable, overrides: Iterable[Override]) -> Dict[int, List[Tuple[str, int]]]:
+    """{row: [(key, target row), ...]} for the overrides naming known books."""
+    row_by_file = table.row_by_file
+    by_row: Dict[int, List[Tuple[str, int]]] = {}
+    for file_name, key, target, _note in overrides:
+        row, target_row = row_by_file.get(file_name), row_by_file.get(target)
+        if row is not None and target_row is not None and key in _KEY_LEVEL:
+            by_row.setdefault(row, []).append((key, target_row))
+    return by_row
+
+
+class CommentaryEdges:
+    """Many-to-many Mūla/Aṭṭhakathā/Ṭīkā links between BookTable rows.
+
+    ``forward`` holds the links a book declares, with Multi/Split notes
+    expanded; ``reverse`` holds the books that declare a link to it. Both are
+    indexed ``[CommentaryLevel.value][row]``, where the level is that of the
+    books listed. ``level`` is each row's Matn code, except that an override
+    target (an Añña book) takes the level of its key.
+    """
+
+    __slots__ = ("forward", "reverse", "level", "_linked")
+
+    def __init__(self, table: BookTable, overrides: Iterable[Override] = ()):
+        n = len(table)
+        row_of = {index: row for row, index in enumerate(table.index)}
+        forward = [[()] * n for _ in _MATN]
+        reverse = [[[] for _ in range(n)] for _ in _MATN]
+        override_rows = _override_rows(table, overrides)
+        self.level = level_of = array("B", table.matn)
+        for jumps in override_rows.values():
+            for key, target in jumps:
+                level_of[target] = _KEY_LEVEL[key].value
+
+        for level, column in _link_columns(table):
+            for row, value in enumerate(column):
+                if value == NO_INDEX:
+                    continue
+                indices = table.covers.get((row, level.value), (value,))
+                # unknown targets (e.g. the TikaIndex 99999 placeholder) are not edges
+                targets = tuple(row_of[i] for i in indices if i in row_of)
+                forward[level.value][row] = targets
+                for target in targets:
+                    reverse[level_of[row]][target].append(row)
+
+        for row, jumps in override_rows.items():
+            for key, target in jumps:
+                forward[_KEY_LEVEL[key].value][row] += (target,)
+                reverse[level_of[row]][target].append(row)
+
+        self.forward = tuple(tuple(rows) for rows in forward)
+        self.reverse = tuple(tuple(tuple(r) for r in rows) for rows in reverse)
+        self._linked = tuple(
+            tuple(
+                tuple(sorted(set(fwd).union(rev))) if rev else fwd
+                for fwd, rev in zip(self.forward[code], self.reverse[code])
+            )
+            for code in range(len(_MATN))
+        )
+
+    def targets(self, row: int, level: CommentaryLevel) -> Tuple[int, ...]:
+        return self.forward[level.value][row]
+
+    def sources(self, row: int, level: CommentaryLevel) -> Tuple[int, ...]:
+        return self.reverse[level.value][row]
+
+    def linked(self, row: int, level: CommentaryLevel) -> Tuple[int, ...]:
+        """Rows at ``level`` linked to ``row`` in either direction."""
+        return self._linked[level.value][row]
+
+
+_LINK_LEVELS = (CommentaryLevel.Mula, CommentaryLevel.Atthakatha, CommentaryLevel.Tika)
+
+
+class CommentaryFamilies:
+    """Connected commentary families and shortest routes between their levels.
+
+    Computed once from the edge index: every row gets a family id, and for
+    each level a breadth-first pass from all rows at that level gives every
+    row its nearest rows there and its next hop towards the first of them.
+    Routes follow those parent pointers and paths are searched on demand, so
+    nothing grows with the square of the family size. Rows are placed at their ``edges.level``, so override
+    targets count at the level of their key.
+    """
+
+    __slots__ = ("family", "_neighbours", "_members", "_nearest", "_parent")
+
+    def __init__(self, table: BookTable, edges: CommentaryEdges):
+        n = len(table)
+        level_of = edges.level
+        neighbours = [
+            tuple(sorted({r for level in _LINK_LEVELS for r in edges.linked(row, level)}))
+            for row in range(n)
+        ]
+        self.family = array("i", [NO_INDEX]) * n
+        members: List[Tuple[Tuple[int, ...], ...]] = []
+        nearest = [[()] * n for _ in _MATN]
+        parents = [array("i", [NO_INDEX]) * n for _ in _MATN]
+
+        for start in range(n):
+            if self.family[start] != NO_INDEX:
+                continue
+            self.family[start] = len(members)
+            order = [start]
+            for node in order:
+                for nb in neighbours[node]:
+                    if self.family[nb] == NO_INDEX:
+                        self.family[nb] = len(members)
+                        order.append(nb)
+            by_level = [[] for _ in _MATN]
+            for node in sorted(order):
+                by_level[level_of[node]].append(node)
+            members.append(tuple(tuple(rows) for rows in by_level))
+
+        dist = array("i", [NO_INDEX]) * n
+        for level in _LINK_LEVELS:
+            # one breadth-first pass from every row at the level; a row's
+            # nearest set is the union of those of its neighbours one hop
+            # closer, and its parent the lowest of them that reaches the
+            # first row in that set (the lowest-rows-first shortest path)
+            near, parent = nearest[level.value], parents[level.value]
+            dist[:] = array("i", [NO_INDEX]) * n
+            order = [row for row in range(n) if level_of[row] == level.value]
+            for row in order:
+                dist[row] = 0
+                near[row] = (row,)
+                parent[row] = row
+            for node in order:
+                for nb in neighbours[node]:
+                    if dist[nb] == NO_INDEX:
+                        dist[nb] = dist[node] + 1
+                        order.append(nb)
+            for node in order:
+                if dist[node]:
+                    closer = [nb for nb in neighbours[node] if dist[nb] == dist[node] - 1]
+                    near[node] = tuple(sorted({r for nb in closer for r in near[nb]}))
+                    parent[node] = next(nb for nb in closer if near[nb][0] == near[node][0])
+
+        self._neighbours = neighbours
+        self._members = tuple(members)
+        self._nearest = tuple(tuple(rows) for rows in nearest)
+        self._parent = tuple(parents)
+
+    def family_of(self, row: int) -> int:
+        return self.family[row]
+
+    def members(self, row: int, level: CommentaryLevel) -> Tuple[int, ...]:
+        """All rows at ``level`` in the family of ``row``."""
+        return self._members[self.family[row]][level.value]
+
+    def nearest(self, row: int, level: CommentaryLevel) -> Tuple[int, ...]:
+        """Rows at ``level`` with the fewest hops from ``row``."""
+        return self._nearest[level.value][row]
+
+    def path(self, src: int, dst: int) -> Optional[Tuple[int, ...]]:
+        """Shortest row path from ``src`` to ``dst``; None across families.
+
+        Of several shortest paths, the one with the lowest rows first.
+        """
+        if self.family[src] != self.family[dst]:
+            return None
+        parent = {src: src}
+        order = [src]
+        for node in order:
+            if node == dst:
+                break
+            for nb in self._neighbours[node]:
+                if nb not in parent:
+                    parent[nb] = node
+                    order.append(nb)
+        path = [dst]
+        while path[-1] != src:
+            path.append(parent[path[-1]])
+        return tuple(reversed(path))
+
+    def route(self, row: int, level: CommentaryLevel) -> Optional[Tuple[int, ...]]:
+        """Shortest path from ``row`` to its nearest book at ``level``.
+
+        Same path as ``path(row, nearest(row, level)[0])``, read off the
+        level's breadth-first tree instead of searching the family.
+        """
+        if not self._nearest[level.value][row]:
+            return None
+        parent = self._parent[level.value]
+        route = [row]
+        while parent[route[-1]] != route[-1]:
+            route.append(parent[route[-1]])
+        return tuple(route)
+
+
+# the set bit positions of each byte value
+_BYTE_ROWS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+def iter_rows(bits: int) -> Iterator[int]:
+    """Rows set in a bitmap, in catalog order.
+
+    Reads the bitmap a byte at a time: clearing the lowest bit of a big int
+    copies it, which made a walk over n rows O(n**2).
+    """
+    for offset, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+        if byte:
+            base = offset * 8
+            for bit in _BYTE_ROWS[byte]:
+                yield base + bit
+
+
+def count_rows(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+class BookBitmaps:
+    """One int bitmap (bit = row) per Pitaka, CommentaryLevel, BookType and
+    ChapterListTypes token, so filters are AND/OR of a few ints."""
+
+    __slots__ = ("all", "pitaka", "matn", "book_type", "chapter_type")
+
+    def __init__(self, table: BookTable):
+        self.all = (1 << len(table)) - 1
+        self.pitaka: Dict[Pitaka, int] = dict.fromkeys(Pitaka, 0)
+        self.matn: Dict[CommentaryLevel, int] = dict.fromkeys(CommentaryLevel, 0)
+        self.book_type: Dict[BookType, int] = dict.fromkeys(BookType, 0)
+        self.chapter_type: Dict[str, int] = {}
+
+        for row in range(len(table)):
+            bit = 1 << row
+            if table.pitaka[row]:
+                self.pitaka[_PITAKA[table.pitaka[row]]] |= bit
+            if table.matn[row]:
+                self.matn[_MATN[table.matn[row]]] |= bit
+            self.book_type[_BOOK_TYPE[table.book_type[row]]] |= bit
+            chapters = table.chapter_list_types[row]
+            for token in chapters.split(",") if chapters else ():
+                self.chapter_type[token] = self.chapter_type.get(token, 0) | bit
+
+    def select(
+        self,
+        pitaka: Union[Pitaka, Iterable[Pitaka], None] = None,
+        matn: Union[CommentaryLevel, Iterable[CommentaryLevel], None] = None,
+        book_type: Union[BookType, Iterable[BookType], None] = None,
+        chapter_type: Union[str, Iterable[str], None] = None,
+    ) -> int:
+        """Bitmap of rows matching every given field; several values for one
+        field match any of them, e.g. ``select(Pitaka.Sutta, CommentaryLevel.Tika,
+        BookType.Split)`` or ``select(chapter_type=("peyyala", "kanda"))``."""
+        bits = self.all
+        for index, value in (
+            (self.pitaka, pitaka),
+            (self.matn, matn),
+            (self.book_type, book_type),
+            (self.chapter_type, chapter_type),
+        ):
+            if value is None:
+                continue
+            if isinstance(value, (str, Enum)):
+                bits &= index.get(value, 0)
+            else:
+                any_of = 0
+                for v in value:
+                    any_of |= index.get(v, 0)
+                bits &= any_of
+        return bits
+
+    def facets(self, bits: int, field: str) -> Dict[object, int]:
+        """Row counts per value of ``field`` ("pitaka", "matn", ...) within ``bits``."""
+        return {value: count_rows(bits & mask) for value, mask in getattr(self, field).items()}
+
+
+class JumpColumns(NamedTuple):
+    """Batch lookup result: one list per tpo_map field, aligned with the input;
+    every field is None for unknown filenames."""
+
+    m: List[Optional[str]]
+    a: List[Optional[str]]
+    t: List[Optional[str]]
+    y: List[Optional[str]]
+
+
+class JumpTable:
+    """tpo_map jump targets per row: the "m"/"a"/"t" filenames, the "y" flags
+    (the keys in tpo_map order, overrides last) and a serialized JSON member,
+    rendered on first use. Each column carries a trailing None so that row -1
+    (unknown filename) resolves without a branch."""
+
+    __slots__ = ("m", "a", "t", "y", "_names", "_json")
+
+    def __init__(self, table: BookTable, overrides: Iterable[Override] = ()):
+        names = table.file_name
+        row_of = {index: row for row, index in enumerate(table.index)}
+        manual = _override_rows(table, overrides)
+        columns = {"m": [], "a": [], "t": []}
+        flags = []
+
+        for row in range(len(table)):
+            entry = {}
+            y = ""
+            for (_level, column), key in zip(_link_columns(table), ("m", "a", "t")):
+                target = row_of.get(column[row])  # None also for NO_INDEX and 99999
+                if target is not None:
+                    entry[key] = names[target]
+                    y += key
+            for key, target in manual.get(row, ()):
+                entry[key] = names[target]
+                y += key
+            for key in ("m", "a", "t"):
+                columns[key].append(entry.get(key))
+            flags.append(sys.intern(y))
+
+        self.m = tuple(columns["m"]) + (None,)
+        self.a = tuple(columns["a"]) + (None,)
+        self.t = tuple(columns["t"]) + (None,)
+        self.y = tuple(flags) + (None,)
+        self._names = names
+        self._json: Optional[Tuple[str, ...]] = None
+
+    @property
+    def json(self) -> Tuple[str, ...]:
+        """The ``"file":{"y":..,"m":..}`` member of each row, serialized on
+        first use so that loading the catalog does not load a JSON backend."""
+        if self._json is None:
+            backend = get_json_backend()
+            self._json = tuple(
+                backend.string(name) + ":" + backend.dumps({"y": y, **{key: getattr(self, key)[row] for key in y}})
+                for row, (name, y) in enumerate(zip(self._names, self.y))
+            )
+        return self._json
+
+
+def _mph_hash(key: str, salt: int) -> Tuple[int, int, int]:
+    # one C-level crc32 seeded with the salt, cut into 11, 11 and 10 bits
+    x = zlib.crc32(key.encode("utf-8"), salt)
+    return x & 0x7FF, (x >> 11) & 0x7FF, x >> 22
+
+
+class FilenameHash:
+    """Minimal perfect hash (CHD) from a fixed set of filenames to row ids.
+
+    Each key hashes once (crc32 seeded with the salt) into a bucket and two
+    offsets; the bucket's displacement picks a slot in ``range(n)`` and
+    ``rows[slot]`` is the row id. ``keys`` is kept for exact-match checks.
+
+    This is the index written to filename_hash.json for consumers outside
+    this process. In Python, ``table.row_by_file`` stays the lookup path: a
+    str caches its hash, so a dict lookup (about 30 ns) beats any hash
+    computed in Python code (about 430 ns here; ``bench.py filename_hash``).
+    """
+
+    __slots__ = ("salt", "displacements", "rows", "keys")
+
+    BUCKET_SIZE = 4
+
+    def __init__(self, salt: int, displacements: array, rows: array, keys: Tuple[str, ...]):
+        self.salt = salt
+        self.displacements = displacements
+        self.rows = rows
+        self.keys = keys
+
+    @classmethod
+    def build(cls, keys: Tuple[str, ...]) -> "FilenameHash":
+        n = len(keys)
+        n_buckets = max(1, -(-n // cls.BUCKET_SIZE))
+        for salt in range(1000):
+            table = cls._place(keys, salt, n, n_buckets)
+            if table is not None:
+                return table
+        raise ValueError("no perfect hash found for the given keys")
+
+    @classmethod
+    def _place(cls, keys, salt, n, n_buckets) -> Optional["FilenameHash"]:
+        buckets: List[List[Tuple[int, int, int]]] = [[] for _ in range(n_buckets)]
+        for row, key in enumerate(keys):
+            h0, h1, h2 = _mph_hash(key, salt)
+            buckets[h0 % n_buckets].append((row, h1 % n, h2 % n))
+
+        displacements = array("i", [0]) * n_buckets
+        rows = array("i", [NO_INDEX]) * n
+        for bucket in sorted(range(n_buckets), key=lambda b: -len(buckets[b])):
+            entries = buckets[bucket]
+            if not entries:
+                continue
+            for d in range(n * n):
+                d0, d1 = divmod(d, n)
+                slots = {(f1 + d0 * f2 + d1) % n for _, f1, f2 in entries}
+                if len(slots) == len(entries) and all(rows[slot] == NO_INDEX for slot in slots):
+                    break
+            else:
+                return None  # two keys share (f1, f2); retry with another salt
+            displacements[bucket] = d
+            for row, f1, f2 in entries:
+                rows[(f1 + d0 * f2 + d1) % n] = row
+        return cls(salt, displacements, rows, tuple(keys))
+
+    def lookup(self, key: str) -> int:
+        """Row id of ``key``, or -1 when it is not one of the keys."""
+        rows = self.rows
+        n = len(rows)
+        if not n:
+            return NO_INDEX
+        # _mph_hash inlined; (h1 + d0 * h2 + d1) % n, with d = d0 * n + d1
+        x = zlib.crc32(key.encode("utf-8"), self.salt)
+        d = self.displacements[(x & 0x7FF) % len(self.displacements)]
+        row = rows[((x >> 11 & 0x7FF) + d // n * (x >> 22) + d) % n]
+        return row if self.keys[row] == key else NO_INDEX
+
+    def to_dict(self):
+        return {
+            "hash": "crc32",
+            "salt": self.salt,
+            "displacements": self.displacements.tolist(),
+            "rows": self.rows.tolist(),
+            "keys": list(self.keys),
+        }
+
+    @classmethod
+    def from_dict(cls, data) -> "FilenameHash":
+        if data.get("hash") != "crc32":
+            # salts and displacements only mean something for the same hash
+            raise ValueError(f"filename hash {data.get('hash')!r} is not crc32; rebuild filename_hash.json")
+        return cls(
+            data["salt"],
+            array("i", data["displacements"]),
+            array("i", data["rows"]),
+            tuple(data["keys"]),
+        )
+
+
+class Catalog(NamedTuple):
+    table: BookTable
+    books: Tuple[BookRow, ...]
+    books_by_file: Mapping[str, BookRow]
+    edges: CommentaryEdges
+    families: CommentaryFamilies
+    bitmaps: BookBitmaps
+    jumps: JumpTable
+
+    def find(self, **fields) -> Iterator[BookRow]:
+        """Lazily yield books matching ``BookBitmaps.select(**fields)``."""
+        books = self.books
+        return (books[row] for row in iter_rows(self.bitmaps.select(**fields)))
+
+    def resolve_many(self, file_names: Iterable[str]) -> JumpColumns:
+        """Jump targets and "y" flags for many filenames in one call."""
+        get_row = self.table.row_by_file.get
+        rows = [get_row(name, -1) for name in file_names]
+        jumps = self.jumps
+        return JumpColumns(
+            list(map(jumps.m.__getitem__, rows)),
+            list(map(jumps.a.__getitem__, rows)),
+            list(map(jumps.t.__getitem__, rows)),
+            list(map(jumps.y.__getitem__, rows)),
+        )
+
+    def resolve_many_json(self, file_names: Iterable[str]) -> str:
+        """``resolve_many`` as a JSON object keyed by filename, built from
+        pre-serialized members; unknown filenames map to null."""
+        get_row = self.table.row_by_file.get
+        members = self.jumps.json
+        string = get_json_backend().string
+        parts = []
+        for name in file_names:
+            row = get_row(name)
+            parts.append(members[row] if row is not None else string(name) + ":null")
+        return "{" + ",".join(parts) + "}"
+
+    def linked_files(self, file_name: str, level: CommentaryLevel) -> Tuple[str, ...]:
+        """e.g. ``linked_files("s0402a.att.xml", CommentaryLevel.Mula)``"""
+        names = self.table.file_name
+        rows = self.edges.linked(self.table.row_by_file[file_name], level)
+        return tuple(names[row] for row in rows)
+
+    def nearest_files(self, file_name: str, level: CommentaryLevel) -> Tuple[str, ...]:
+        """e.g. the mūla of a ṭīkā, even when only its aṭṭhakathā is recorded"""
+        names = self.table.file_name
+        rows = self.families.nearest(self.table.row_by_file[file_name], level)
+        return tuple(names[row] for row in rows)
+
+
+def validate_catalog(table: BookTable, overrides: Iterable[Override] = ()) -> List[str]:
+    """Check the table and the overrides in one pass over the rows.
+
+    Index must equal the row (dense, unique, Books.cs order), filenames must
+    be unique, every relation must point at an existing book of the
+    relation's level, and when the target links back at the source's level
+    that link must include the source. An override must name known books,
+    set each key of a book once and not compete with a catalog relation.
+    """
+    errors: List[str] = []
+    n = len(table)
+    names = table.file_name
+    links = {level.value: column for level, column in _link_columns(table)}
+
+    def links_back(row: int, level: int) -> Tuple[int, ...]:
+        value = links[level][row]
+        if value == NO_INDEX or value == NO_TIKA:
+            return ()
+        return table.covers.get((row, level), (value,))
+
+    for row in range(n):
+        name = names[row]
+        if table.index[row] != row:
+            errors.append(f"{name}: Index {table.index[row]} at row {row}")
+        if table.row_by_file[name] != row:
+            errors.append(f"{name}: duplicate FileName (rows {row}, {table.row_by_file[name]})")
+
+        source_level = table.matn[row]
+        for level, column in links.items():
+            value = column[row]
+            if value == NO_INDEX or (value == NO_TIKA and level == CommentaryLevel.Tika.value):
+                continue
+            field = _MATN[level].name
+            for target in table.covers.get((row, level), (value,)):
+                if not (0 <= target < n and table.index[target] == target):
+                    errors.append(f"{name}: {field} link to unknown Index {target}")
+                    continue
+                if table.matn[target] != level:
+                    target_level = _MATN[table.matn[target]]
+                    errors.append(
+                        f"{name}: {field} link to {names[target]}, which is "
+                        f"{target_level.name if target_level else 'unset'}"
+                    )
+                if source_level in links:
+                    back = links_back(target, source_level)
+                    if back and row not in back:
+                        errors.append(f"{name}: {names[target]} does not link back to it")
+
+    seen = set()
+    placed: Dict[str, int] = {}  # override target -> level of its key
+    for file_name, key, target, _note in overrides:
+        label = f"override {file_name} {key} {target}"
+        for jump_file in (file_name, target):
+            if jump_file not in table.row_by_file:
+                errors.append(f"{label}: unknown {jump_file}")
+        if key not in _KEY_LEVEL:
+            errors.append(f"{label}: Key must be one of {', '.join(_KEY_LEVEL)}")
+            continue
+        if (file_name, key) in seen:
+            errors.append(f"{label}: {file_name} already has a {key} override")
+        seen.add((file_name, key))
+        row = table.row_by_file.get(file_name)
+        level = _KEY_LEVEL[key].value
+        target_row = table.row_by_file.get(target)
+        if target_row is not None:
+            # the target takes the key's level in the edges and families
+            target_level = table.matn[target_row]
+            if target_level not in (level, 0, CommentaryLevel.Other.value):
+                errors.append(f"{label}: {target} is {_MATN[target_level].name}, not {_MATN[level].name}")
+            elif placed.setdefault(target, level) != level:
+                errors.append(f"{label}: {target} is already a {_MATN[placed[target]].name} override target")
+        value = links[level][row] if row is not None else NO_INDEX
+        if value != NO_INDEX and not (value == NO_TIKA and level == CommentaryLevel.Tika.value):
+            linked = ", ".join(
+                names[i] if 0 <= i < n else str(i) for i in table.covers.get((row, level), (value,))
+            )
+            errors.append(f"{label}: conflicts with the catalog {_MATN[level].name} link to {linked}")
+
+    return errors
+
+
+def load_catalog(
+    catalog_file: str = CATALOG_FILE, overrides: Optional[Iterable[Override]] = None
+) -> Catalog:
+    """Decode, validate and index one catalog table; ``overrides`` defaults
+    to the OVERRIDES_FILE table."""
+    overrides = load_overrides() if overrides is None else tuple(overrides)
+    table = BookTable.load(catalog_file)
+    errors = validate_catalog(table, overrides)
+    if errors:
+        raise CatalogError(errors)
+    books = tuple(table)
+    books_by_file = {book.FileName: book for book in books}
+    edges = CommentaryEdges(table, overrides)
+    return Catalog(
+        table,
+        books,
+        MappingProxyType(books_by_file),
+        edges,
+        CommentaryFamilies(table, edges),
+        BookBitmaps(table),
+        JumpTable(table, overrides),
     )
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/पटिसम्भिदामग्ग-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 39
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 99
-    book.FileName = "s0519a.att.xml"
-    book.LongNavPath = "अट्ठकथा/सुत्त पिटक (अट्ठकथा)/खुद्दक निकाय (अट्ठकथा)/नेत्तिप्पकरण-अट्ठकथा"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/नेत्तिप्पकरण-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 40
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 100
-    book.FileName = "vin01a.att.xml"
-    book.LongNavPath = "अट्ठकथा/विनय पिटक (अट्ठकथा)/पाराजिककण्ड-अट्ठकथा"
-    book.ShortNavPath = "वि॰ पि॰/पाराजिककण्ड-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Whole
-    book.MulaIndex = 43
-    book.TikaIndex = 127  # 127 + 128
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 101
-    book.FileName = "vin02a1.att.xml"
-    book.LongNavPath = "अट्ठकथा/विनय पिटक (अट्ठकथा)/पाचित्तिय-अट्ठकथा"
-    book.ShortNavPath = "वि॰ पि॰/पाचित्तिय-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Whole
-    book.MulaIndex = 44
-    book.TikaIndex = 129
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 102
-    book.FileName = "vin02a2.att.xml"
-    book.LongNavPath = "अट्ठकथा/विनय पिटक (अट्ठकथा)/महावग्ग-अट्ठकथा"
-    book.ShortNavPath = "वि॰ पि॰/महावग्ग-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Whole
-    book.MulaIndex = 45
-    book.TikaIndex = 129
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 103
-    book.FileName = "vin02a3.att.xml"
-    book.LongNavPath = "अट्ठकथा/विनय पिटक (अट्ठकथा)/चूळवग्ग-अट्ठकथा"
-    book.ShortNavPath = "वि॰ पि॰/चूळवग्ग-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Whole
-    book.MulaIndex = 46
-    book.TikaIndex = 129
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 104
-    book.FileName = "vin02a4.att.xml"
-    book.LongNavPath = "अट्ठकथा/विनय पिटक (अट्ठकथा)/परिवार-अट्ठकथा"
-    book.ShortNavPath = "वि॰ पि॰/परिवार-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Whole
-    book.MulaIndex = 47
-    book.TikaIndex = 129
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 105
-    book.FileName = "abh01a.att.xml"
-    book.LongNavPath = "अट्ठकथा/अभिधम्म पिटक (अट्ठकथा)/धम्मसङ्गणि-अट्ठकथा"
-    book.ShortNavPath = "अभि॰ पि॰/धम्मसङ्गणि-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Abhidhamma
-    book.MulaIndex = 48
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 106
-    book.FileName = "abh02a.att.xml"
-    book.LongNavPath = "अट्ठकथा/अभिधम्म पिटक (अट्ठकथा)/सम्मोहविनोदनी-अट्ठकथा"
-    book.ShortNavPath = "अभि॰ पि॰/सम्मोहविनोदनी-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Abhidhamma
-    book.MulaIndex = 49
-    book.TikaIndex = 141
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 107
-    book.FileName = "abh03a.att.xml"
-    book.LongNavPath = "अट्ठकथा/अभिधम्म पिटक (अट्ठकथा)/पञ्चपकरण-अट्ठकथा"
-    book.ShortNavPath = "अभि॰ पि॰/पञ्चपकरण-अट्ठकथा"
-    book.Matn = CommentaryLevel.Atthakatha
-    book.Pitaka = Pitaka.Abhidhamma
-    book.MulaIndex = 50  # 50 - 60
-    book.TikaIndex = 142
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 108
-    book.FileName = "s0101t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/दीघ निकाय (टीका)/सीलक्खन्धवग्ग-टीका"
-    book.ShortNavPath = "सु॰ पि॰/दी॰ नि॰/सीलक्खन्धवग्ग-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 0
-    book.AtthakathaIndex = 61
-    book.ChapterListTypes = "book,sutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 109
-    book.FileName = "s0102t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/दीघ निकाय (टीका)/महावग्ग-टीका"
-    book.ShortNavPath = "सु॰ पि॰/दी॰ नि॰/महावग्ग-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 1
-    book.AtthakathaIndex = 62
-    book.ChapterListTypes = "book,sutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 110
-    book.FileName = "s0103t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/दीघ निकाय (टीका)/पाथिकवग्ग-टीका"
-    book.ShortNavPath = "सु॰ पि॰/दी॰ नि॰/पाथिकवग्ग-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 2
-    book.AtthakathaIndex = 63
-    book.ChapterListTypes = "book,sutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 111
-    book.FileName = "s0104t.nrf.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/दीघ निकाय (टीका)/सीलक्खन्धवग्ग-अभिनवटीका-१"
-    book.ShortNavPath = "सु॰ पि॰/दी॰ नि॰/सीलक्खन्धवग्ग-अभिनवटीका-१"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 112
-    book.FileName = "s0105t.nrf.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/दीघ निकाय (टीका)/सीलक्खन्धवग्ग-अभिनवटीका-२"
-    book.ShortNavPath = "सु॰ पि॰/दी॰ नि॰/सीलक्खन्धवग्ग-अभिनवटीका-२"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 113
-    book.FileName = "s0201t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/मज्झिम निकाय (टीका)/मूलपण्णास-टीका"
-    book.ShortNavPath = "सु॰ पि॰/म॰ नि॰/मूलपण्णास-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 3
-    book.AtthakathaIndex = 64
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 114
-    book.FileName = "s0202t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/मज्झिम निकाय (टीका)/मज्झिमपण्णास-टीका"
-    book.ShortNavPath = "सु॰ पि॰/म॰ नि॰/मज्झिमपण्णास-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 4
-    book.AtthakathaIndex = 65
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 115
-    book.FileName = "s0203t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/मज्झिम निकाय (टीका)/उपरिपण्णास-टीका"
-    book.ShortNavPath = "सु॰ पि॰/म॰ नि॰/उपरिपण्णास-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 5
-    book.AtthakathaIndex = 66
-    book.ChapterListTypes = "book,vagga"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 116
-    book.FileName = "s0301t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/संयुत्त निकाय (टीका)/सगाथावग्ग-टीका"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/सगाथावग्ग-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 6
-    book.AtthakathaIndex = 67
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 117
-    book.FileName = "s0302t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/संयुत्त निकाय (टीका)/निदानवग्ग-टीका"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/निदानवग्ग-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 7
-    book.AtthakathaIndex = 68
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 118
-    book.FileName = "s0303t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/संयुत्त निकाय (टीका)/खन्धवग्ग-टीका"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/खन्धवग्ग-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 8
-    book.AtthakathaIndex = 69
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 119
-    book.FileName = "s0304t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/संयुत्त निकाय (टीका)/सळायतनवग्ग-टीका"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/सळायतनवग्ग-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 9
-    book.AtthakathaIndex = 70
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 120
-    book.FileName = "s0305t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/संयुत्त निकाय (टीका)/महावग्ग-टीका"
-    book.ShortNavPath = "सु॰ पि॰/सं॰ नि॰/महावग्ग-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 10
-    book.AtthakathaIndex = 71
-    book.ChapterListTypes = "book,samyutta"
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 121
-    book.FileName = "s0401t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/अङ्गुत्तरनिकाय (टीका)/एककनिपात-टीका"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/एककनिपात-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Whole
-    book.MulaIndex = 11
-    book.AtthakathaIndex = 72
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 122
-    book.FileName = "s0402t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/अङ्गुत्तरनिकाय (टीका)/दुक-तिक-चतुक्कनिपात-टीका"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/दुक-तिक-चतुक्कनिपात-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Multi
-    book.MulaIndex = 12  # 12 + 13 + 14
-    book.AtthakathaIndex = 73
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 123
-    book.FileName = "s0403t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/अङ्गुत्तरनिकाय (टीका)/पञ्चक-छक्क-सत्तकनिपात-टीका"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/पञ्चक-छक्क-सत्तकनिपात-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Multi
-    book.MulaIndex = 15  # 15 + 16 + 17
-    book.AtthakathaIndex = 74
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 124
-    book.FileName = "s0404t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/अङ्गुत्तरनिकाय (टीका)/अट्ठकादिनिपात-टीका"
-    book.ShortNavPath = "सु॰ पि॰/अ॰ नि॰/अट्ठकादिनिपात-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    book.BookType = BookType.Multi
-    book.MulaIndex = 18  # 18 + 19 + 20 + 21
-    book.AtthakathaIndex = 75
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    # The filenames of this book and the next are out of order, but this is the order
-    # in which the books are listed in CSCD3
-    book = Book()
-    book.Index = 125
-    book.FileName = "s0519t.tik.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/खुद्दकनिकाय (टीका)/नेत्तिप्पकरण-टीका"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/नेत्तिप्पकरण-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 126
-    book.FileName = "s0501t.nrf.xml"
-    book.LongNavPath = "टीका/सुत्त पिटक (टीका)/खुद्दकनिकाय (टीका)/नेत्तिविभाविनी"
-    book.ShortNavPath = "सु॰ पि॰/खु॰ नि॰/नेत्तिविभाविनी"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Sutta
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 127
-    book.FileName = "vin01t1.tik.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/सारत्थदीपनी-टीका-१"
-    book.ShortNavPath = "वि॰ पि॰/सारत्थदीपनी-टीका-१"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Split
-    book.MulaIndex = 43
-    book.AtthakathaIndex = 100
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 128
-    book.FileName = "vin01t2.tik.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/सारत्थदीपनी-टीका-२"
-    book.ShortNavPath = "वि॰ पि॰/सारत्थदीपनी-टीका-२"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Split
-    book.MulaIndex = 43
-    book.AtthakathaIndex = 100
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 129
-    book.FileName = "vin02t.tik.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/सारत्थदीपनी-टीका-३"
-    book.ShortNavPath = "वि॰ पि॰/सारत्थदीपनी-टीका-३"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    book.BookType = BookType.Multi
-    book.MulaIndex = 44  # 44 + 45 + 46 + 47
-    book.AtthakathaIndex = 101  # 101 + 102 + 103 + 104
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 130
-    book.FileName = "vin04t.nrf.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/द्वेमातिकापाळि"
-    book.ShortNavPath = "वि॰ पि॰/द्वेमातिकापाळि"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 131
-    book.FileName = "vin05t.nrf.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/विनयसङ्गह-अट्ठकथा"
-    book.ShortNavPath = "वि॰ पि॰/विनयसङ्गह-अट्ठकथा"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 132
-    book.FileName = "vin06t.nrf.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/वजिरबुद्धि-टीका"
-    book.ShortNavPath = "वि॰ पि॰/वजिरबुद्धि-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 133
-    book.FileName = "vin07t.nrf.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/विमतिविनोदनी-टीका"
-    book.ShortNavPath = "वि॰ पि॰/विमतिविनोदनी-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 134
-    book.FileName = "vin08t.nrf.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/विनयालङ्कार-टीका"
-    book.ShortNavPath = "वि॰ पि॰/विनयालङ्कार-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 135
-    book.FileName = "vin09t.nrf.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/कङ्खावितरणीपुराण-टीका"
-    book.ShortNavPath = "वि॰ पि॰/कङ्खावितरणीपुराण-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 136
-    book.FileName = "vin10t.nrf.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/विनयविनिच्छय-उत्तरविनिच्छय"
-    book.ShortNavPath = "वि॰ पि॰/विनयविनिच्छय-उत्तरविनिच्छय"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 137
-    book.FileName = "vin11t.nrf.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/विनयविनिच्छय-टीका"
-    book.ShortNavPath = "वि॰ पि॰/विनयविनिच्छय-टीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 138
-    book.FileName = "vin12t.nrf.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/पाचित्यादियोजनापाळि"
-    book.ShortNavPath = "वि॰ पि॰/पाचित्यादियोजनापाळि"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 139
-    book.FileName = "vin13t.nrf.xml"
-    book.LongNavPath = "टीका/विनयपिटक (टीका)/खुद्दसिक्खा-मूलसिक्खा"
-    book.ShortNavPath = "वि॰ पि॰/खुद्दसिक्खा-मूलसिक्खा"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Vinaya
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 140
-    book.FileName = "abh01t.tik.xml"
-    book.LongNavPath = "टीका/अभिधम्म पिटक (टीका)/धम्मसङ्गणी-मूलटीका"
-    book.ShortNavPath = "अभि॰ पि॰/धम्मसङ्गणी-मूलटीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Abhidhamma
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 141
-    book.FileName = "abh02t.tik.xml"
-    book.LongNavPath = "टीका/अभिधम्म पिटक (टीका)/विभङ्ग-मूलटीका"
-    book.ShortNavPath = "अभि॰ पि॰/विभङ्ग-मूलटीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Abhidhamma
-    book.MulaIndex = 49
-    book.AtthakathaIndex = 106
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 142
-    book.FileName = "abh03t.tik.xml"
-    book.LongNavPath = "टीका/अभिधम्म पिटक (टीका)/पञ्चपकरण-मूलटीका"
-    book.ShortNavPath = "अभि॰ पि॰/पञ्चपकरण-मूलटीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Abhidhamma
-    book.MulaIndex = 50  # 50 - 60
-    book.AtthakathaIndex = 107
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 143
-    book.FileName = "abh04t.nrf.xml"
-    book.LongNavPath = "टीका/अभिधम्म पिटक (टीका)/धम्मसङ्गणी-अनुटीका"
-    book.ShortNavPath = "अभि॰ पि॰/धम्मसङ्गणी-अनुटीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Abhidhamma
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 144
-    book.FileName = "abh05t.nrf.xml"
-    book.LongNavPath = "टीका/अभिधम्म पिटक (टीका)/पञ्चपकरण-अनुटीका"
-    book.ShortNavPath = "अभि॰ पि॰/पञ्चपकरण-अनुटीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Abhidhamma
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 145
-    book.FileName = "abh06t.nrf.xml"
-    book.LongNavPath = "टीका/अभिधम्म पिटक (टीका)/अभिधम्मावतारो-नामरूपपरिच्छेदो"
-    book.ShortNavPath = "अभि॰ पि॰/अभिधम्मावतारो-नामरूपपरिच्छेदो"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Abhidhamma
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 146
-    book.FileName = "abh07t.nrf.xml"
-    book.LongNavPath = "टीका/अभिधम्म पिटक (टीका)/अभिधम्मत्थसङ्गहो"
-    book.ShortNavPath = "अभि॰ पि॰/अभिधम्मत्थसङ्गहो"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Abhidhamma
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 147
-    book.FileName = "abh08t.nrf.xml"
-    book.LongNavPath = "टीका/अभिधम्म पिटक (टीका)/अभिधम्मावतार-पुराणटीका"
-    book.ShortNavPath = "अभि॰ पि॰/अभिधम्मावतार-पुराणटीका"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Abhidhamma
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 148
-    book.FileName = "abh09t.nrf.xml"
-    book.LongNavPath = "टीका/अभिधम्म पिटक (टीका)/अभिधम्ममातिकापाळि"
-    book.ShortNavPath = "अभि॰ पि॰/अभिधम्ममातिकापाळि"
-    book.Matn = CommentaryLevel.Tika
-    book.Pitaka = Pitaka.Abhidhamma
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 149
-    book.FileName = "e0101n.mul.xml"
-    book.LongNavPath = "अञ्‍ञ/विसुद्धिमग्ग/विसुद्धिमग्ग-१"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 150
-    book.FileName = "e0102n.mul.xml"
-    book.LongNavPath = "अञ्‍ञ/विसुद्धिमग्ग/विसुद्धिमग्ग-२"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 151
-    book.FileName = "e0103n.att.xml"
-    book.LongNavPath = "अञ्‍ञ/विसुद्धिमग्ग/विसुद्धिमग्ग-महाटीका-१"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 152
-    book.FileName = "e0104n.att.xml"
-    book.LongNavPath = "अञ्‍ञ/विसुद्धिमग्ग/विसुद्धिमग्ग-महाटीका-२"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 153
-    book.FileName = "e0105n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/विसुद्धिमग्ग/विसुद्धिमग्ग-निदानकथा"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 154
-    book.FileName = "e0901n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/संगायन-पुच्छा विस्सज्‍जना/दीघनिकाय (पु-वि)"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 155
-    book.FileName = "e0902n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/संगायन-पुच्छा विस्सज्‍जना/मज्झिमनिकाय (पु-वि)"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 156
-    book.FileName = "e0903n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/संगायन-पुच्छा विस्सज्‍जना/संयुत्तनिकाय (पु-वि)"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 157
-    book.FileName = "e0904n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/संगायन-पुच्छा विस्सज्‍जना/अङ्गुत्तरनिकाय (पु-वि)"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 158
-    book.FileName = "e0905n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/संगायन-पुच्छा विस्सज्‍जना/विनयपिटक (पु-वि)"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 159
-    book.FileName = "e0906n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/संगायन-पुच्छा विस्सज्‍जना/अभिधम्मपिटक (पु-वि)"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 160
-    book.FileName = "e0907n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/संगायन-पुच्छा विस्सज्‍जना/अट्ठकथा (पु-वि)"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 161
-    book.FileName = "e0201n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/लेडी सयाडो गन्थ-सङ्गहो/निरुत्तिदीपनी"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 162
-    book.FileName = "e0301n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/लेडी सयाडो गन्थ-सङ्गहो/परमत्थदीपनी सङ्गहमहाटीकापाठ"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 163
-    book.FileName = "e0401n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/लेडी सयाडो गन्थ-सङ्गहो/अनुदीपनीपाठ"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 164
-    book.FileName = "e0501n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/लेडी सयाडो गन्थ-सङ्गहो/पट्ठानुद्देसदीपनीपाठ"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 165
-    book.FileName = "e0601n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/बुद्ध-वन्दना गन्थ-सङ्गहो/नमक्‍कारटीका"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 166
-    book.FileName = "e0602n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/बुद्ध-वन्दना गन्थ-सङ्गहो/महापणामपाठ"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 167
-    book.FileName = "e0603n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/बुद्ध-वन्दना गन्थ-सङ्गहो/लक्खणातो बुद्धथोमनागाथा"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 168
-    book.FileName = "e0604n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/बुद्ध-वन्दना गन्थ-सङ्गहो/सुतवन्दना"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 169
-    book.FileName = "e0605n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/बुद्ध-वन्दना गन्थ-सङ्गहो/जिनालङ्कार"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 170
-    book.FileName = "e0606n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/बुद्ध-वन्दना गन्थ-सङ्गहो/कमलाञ्‍जलि"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 171
-    book.FileName = "e0607n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/बुद्ध-वन्दना गन्थ-सङ्गहो/पज्‍जमधु"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 172
-    book.FileName = "e0608n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/बुद्ध-वन्दना गन्थ-सङ्गहो/बुद्धगुणगाथावली"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 173
-    book.FileName = "e0701n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/वंस-गन्थ-सङ्गहो/चूळगन्थवंस"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 174
-    book.FileName = "e0702n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/वंस-गन्थ-सङ्गहो/सासनवंस"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 175
-    book.FileName = "e0703n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/वंस-गन्थ-सङ्गहो/महावंस"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 176
-    book.FileName = "e0801n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/मोग्गल्‍लानब्याकरणं"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 177
-    book.FileName = "e0802n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/कच्‍चायनब्याकरणं"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 178
-    book.FileName = "e0803n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/सद्दनीतिप्पकरणं (पदमाला)"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 179
-    book.FileName = "e0804n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/सद्दनीतिप्पकरणं (धातुमाला)"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 180
-    book.FileName = "e0805n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/पदरूपसिद्धि"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 181
-    book.FileName = "e0806n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/मोगल्‍लानपञ्‍चिका"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 182
-    book.FileName = "e0807n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/पयोगसिद्धिपाठ"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 183
-    book.FileName = "e0808n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/वुत्तोदयपाठ"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 184
-    book.FileName = "e0809n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/अभिधानप्पदापिकापाठ"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 185
-    book.FileName = "e0810n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/अभिधानप्पदापिकाटीका"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 186
-    book.FileName = "e0811n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/सुबोधालङ्कारपाठ"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 187
-    book.FileName = "e0812n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/सुबोधालङ्कारटीका"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 188
-    book.FileName = "e0813n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/ब्याकरण गन्थ-सङ्गहो/बालावतार गण्ठिपदत्थविनिच्छयसार"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 189
-    book.FileName = "e1001n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/नीति-गन्थ-सङ्गहो/कविदप्पणनीति"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 190
-    book.FileName = "e1002n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/नीति-गन्थ-सङ्गहो/नीतिमञ्‍जरी"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 191
-    book.FileName = "e1003n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/नीति-गन्थ-सङ्गहो/धम्मनीति"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 192
-    book.FileName = "e1004n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/नीति-गन्थ-सङ्गहो/महारहनीति"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 193
-    book.FileName = "e1005n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/नीति-गन्थ-सङ्गहो/लोकनीति"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 194
-    book.FileName = "e1006n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/नीति-गन्थ-सङ्गहो/सुत्तन्तनीति"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 195
-    book.FileName = "e1007n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/नीति-गन्थ-सङ्गहो/सूरस्सतिनीति"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 196
-    book.FileName = "e1008n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/नीति-गन्थ-सङ्गहो/चाणक्यनीति"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 197
-    book.FileName = "e1009n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/नीति-गन्थ-सङ्गहो/नरदक्खदीपनी"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 198
-    book.FileName = "e1010n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/नीति-गन्थ-सङ्गहो/चतुरारक्खदीपनी"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 199
-    book.FileName = "e1101n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/पकिण्णक-गन्थ-सङ्गहो/रसवाहिनी"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 200
-    book.FileName = "e1102n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/पकिण्णक-गन्थ-सङ्गहो/सीमविसोधनीपाठ"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 201
-    book.FileName = "e1103n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/पकिण्णक-गन्थ-सङ्गहो/वेस्सन्तरगीति"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 202
-    book.FileName = "e1201n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/मोग्गल्‍लान वुत्तिविवरणपञ्‍चिका"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 203
-    book.FileName = "e1202n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/थूपवंस"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 204
-    book.FileName = "e1203n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/दाठवंस"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 205
-    book.FileName = "e1204n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/धातुपाठविलासिनिया"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 206
-    book.FileName = "e1205n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/धातुवंस"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 207
-    book.FileName = "e1206n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/हत्थवनगल्‍लविहारवंस"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 208
-    book.FileName = "e1207n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/जिनचरितय"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 209
-    book.FileName = "e1208n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/जिनवंसदीपं"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 210
-    book.FileName = "e1209n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/तेलकटाहगाथा"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 211
-    book.FileName = "e1210n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/मिलिदटीका"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 212
-    book.FileName = "e1211n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/पदमञ्‍जरी"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 213
-    book.FileName = "e1212n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/पदसाधनं"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 214
-    book.FileName = "e1213n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/सद्दबिन्दुपकरणं"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 215
-    book.FileName = "e1214n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/कच्‍चायनधातुमञ्‍जुसा"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
-
-    book = Book()
-    book.Index = 216
-    book.FileName = "e1215n.nrf.xml"
-    book.LongNavPath = "अञ्‍ञ/सिहळ-गन्थ-सङ्गहो/सामन्तकूटवण्णना"
-    book.ShortNavPath = book.LongNavPath
-    book.Matn = CommentaryLevel.Other
-    book.Pitaka = Pitaka.Other
-    # unlinked
-    book_list.append(book)
-    books_by_file[book.FileName] = book
 
-    return book_list, books_by_file
 
+_catalog: Optional[Catalog] = None
+_catalog_lock = threading.Lock()
 
-def export_to_json(book_list, output_file="temp1_indices.json"):
-    books_json = [book.to_dict() for book in book_list]
-    save_file = os.path.join(output_dir, output_file)
 
-    with open(save_file, "w", encoding="utf-8") as f:
-        json.dump(books_json, f, indent=2, ensure_ascii=False)
+def get_catalog() -> Catalog:
+    """Process-wide catalog, decoded on first use and shared afterwards."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = load_catalog()
+    return _catalog
+
+
+# namespace separator in qualified ids, e.g. "cst:s0101m.mul.xml"
+NAMESPACE_SEP = ":"
+
 
-    print(f"Exported {len(books_json)} books to {output_file}")
+class CatalogRegistry:
+    """Several catalogs (each in the Book schema) under separate namespaces.
+
+    Each corpus keeps its own compact table and indexes. A global id is the
+    corpus offset plus the row, so ids are dense across corpora;
+    ``qualified`` names ("ns:file") and plain filenames resolve through
+    dicts, never by scanning.
+    """
+
+    def __init__(self):
+        self._catalogs: Dict[str, Catalog] = {}
+        self._namespaces: List[str] = []
+        self._offsets: List[int] = []
+        self._offset_of: Dict[str, int] = {}
+        self._size = 0
+        self._ids_by_file: Dict[str, Tuple[int, ...]] = {}
+
+    def register(self, namespace: str, catalog: Catalog) -> Catalog:
+        if not namespace or NAMESPACE_SEP in namespace:
+            raise ValueError(f"invalid namespace {namespace!r}")
+        if namespace in self._catalogs:
+            raise ValueError(f"namespace {namespace!r} is already registered")
+
+        offset = self._size
+        for row, file_name in enumerate(catalog.table.file_name):
+            self._ids_by_file[file_name] = self._ids_by_file.get(file_name, ()) + (offset + row,)
+        self._catalogs[namespace] = catalog
+        self._namespaces.append(namespace)
+        self._offsets.append(offset)
+        self._offset_of[namespace] = offset
+        self._size += len(catalog.table)
+        return catalog
+
+    def register_file(self, namespace: str, catalog_file: str, overrides=()) -> Catalog:
+        return self.register(namespace, load_catalog(catalog_file, overrides))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, namespace: str) -> bool:
+        return namespace in self._catalogs
+
+    def namespaces(self) -> Tuple[str, ...]:
+        return tuple(self._namespaces)
+
+    def catalog(self, namespace: str) -> Catalog:
+        return self._catalogs[namespace]
+
+    def global_id(self, namespace: str, file_name: str) -> int:
+        return self._offset_of[namespace] + self._catalogs[namespace].table.row_by_file[file_name]
+
+    def locate(self, global_id: int) -> Tuple[str, int]:
+        """(namespace, row) of a global id."""
+        if not 0 <= global_id < self._size:
+            raise IndexError(global_id)
+        corpus = bisect_right(self._offsets, global_id) - 1
+        return self._namespaces[corpus], global_id - self._offsets[corpus]
+
+    def book(self, global_id: int) -> BookRow:
+        namespace, row = self.locate(global_id)
+        return self._catalogs[namespace].books[row]
+
+    def qualified(self, global_id: int) -> str:
+        namespace, row = self.locate(global_id)
+        return namespace + NAMESPACE_SEP + self._catalogs[namespace].table.file_name[row]
+
+    def resolve(self, qualified: str) -> Optional[BookRow]:
+        """Book for "ns:file", or None."""
+        namespace, _, file_name = qualified.partition(NAMESPACE_SEP)
+        catalog = self._catalogs.get(namespace)
+        return catalog.books_by_file.get(file_name) if catalog else None
+
+    def find_file(self, file_name: str) -> Tuple[int, ...]:
+        """Global ids of every corpus book with this filename."""
+        return self._ids_by_file.get(file_name, ())
+
+
+_registry: Optional[CatalogRegistry] = None
+
+
+def get_registry() -> CatalogRegistry:
+    """Process-wide registry, holding the CST catalog as "cst"."""
+    global _registry
+    if _registry is None:
+        catalog = get_catalog()
+        with _catalog_lock:
+            if _registry is None:
+                registry = CatalogRegistry()
+                registry.register("cst", catalog)
+                _registry = registry
+    return _registry
+
+
+def books_to_dicts(book_list) -> List[dict]:
+    return [book.to_dict() for book in book_list]
+
+
+def iter_filename_records(table: BookTable) -> Iterator[dict]:
+    """``Book.to_dict()`` of each row, one at a time, with the MulaIndex,
+    AtthakathaIndex and TikaIndex cells as filenames (None where the index
+    names no book, e.g. TikaIndex 99999): the temp2_filename.json records."""
+    return _filename_records((book.to_dict() for book in table), dict(zip(table.index, table.file_name)))
+
+
+def _filename_records(records: Iterable[dict], names: Mapping[int, str]) -> Iterator[dict]:
+    for record in records:
+        for field in ("MulaIndex", "AtthakathaIndex", "TikaIndex"):
+            if record[field] is not None:
+                record[field] = names.get(record[field])
+        yield record
+
+
+def iter_json_records(records: Iterable, pretty: bool = True) -> Iterator[str]:
+    """Chunks of a JSON array of ``records`` (indent=2 or minified, as
+    JsonBackend.dumps), one record at a time."""
+    dumps = get_json_backend().dumps
+    if pretty:
+        open_, sep, close = "[\n  ", ",\n  ", "\n]"
+
+        def encode(record):
+            return dumps(record, True).replace("\n", "\n  ")
+
+    else:
+        open_, sep, close = "[", ",", "]"
+        encode = dumps
+
+    first = True
+    for record in records:
+        yield (open_ if first else sep) + encode(record)
+        first = False
+    yield "[]" if first else close
+
+
+def load_json_records(f: IO[str], chunk_size: int = 1 << 16) -> Iterator:
+    """Yield the items of the JSON array in ``f`` (e.g. output/books.json)
+    one at a time, reading ``chunk_size`` characters at a time."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def more() -> bool:
+        nonlocal buf, pos, eof
+        chunk = "" if eof else f.read(chunk_size)
+        eof = not chunk
+        buf, pos = buf[pos:] + chunk, 0
+        return not eof
+
+    def skip_space() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\n\r":
+                pos += 1
+            if pos < len(buf) or not more():
+                return buf[pos] if pos < len(buf) else ""
+
+    if skip_space() != "[":
+        raise ValueError("expected a JSON array")
+    pos += 1
+    if skip_space() == "]":
+        return
+    while True:
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if more():
+                    continue
+                raise
+            if (end == len(buf) or buf[end] not in ",] \t\n\r") and more():
+                continue  # e.g. a number cut at "-1." may go on in the next chunk
+            break
+        pos = end
+        yield item
+        token = skip_space()
+        pos += 1
+        if token == "]":
+            return
+        if token != ",":
+            raise ValueError(f"expected ',' or ']' in JSON array, got {token!r}")
+        skip_space()
+
+
+def export_to_json(book_list, output_file="temp1_indices.json"):
+    """Stream the books (a BookTable, or Book objects) to ``output_file`` in
+    ``output_dir``; the build writes temp1_indices.json the same way."""
+    from atomic_write import write_chunks_atomic
+
+    if isinstance(book_list, BookTable):
+        count, chunks = len(book_list), iter_books_json(book_list)
+    else:
+        records = books_to_dicts(book_list)
+        count, chunks = len(records), iter_json_records(records)
+    write_chunks_atomic(os.path.join(output_dir, output_file), chunks)
+    print(f"Exported {count} books to {output_file}")
 
 
 def convert_indices_to_filenames(temp1="temp1_indices.json"):
-    temp1_file = os.path.join(output_dir, temp1)
+    """Stream ``temp1`` into temp2_filename.json with the relation indices
+    replaced by filenames: one pass to map indices to filenames, a second to
+    rewrite the records one at a time."""
+    from atomic_write import write_chunks_atomic
 
+    temp1_file = os.path.join(output_dir, temp1)
     with open(temp1_file, "r", encoding="utf-8") as f:
-        books_data = json.load(f)
-
-    # Create index to filename mapping
-    index_to_filename = {}
-    for book in books_data:
-        index_to_filename[book["Index"]] = book["FileName"]
-
-    # Replace indices with filenames
-    for book in books_data:
-        if book["MulaIndex"] is not None:
-            book["MulaIndex"] = index_to_filename.get(book["MulaIndex"])
-        if book["AtthakathaIndex"] is not None:
-            book["AtthakathaIndex"] = index_to_filename.get(book["AtthakathaIndex"])
-        if book["TikaIndex"] is not None:
-            # Skip invalid TikaIndex values (99999)
-            if book["TikaIndex"] != 99999:
-                book["TikaIndex"] = index_to_filename.get(book["TikaIndex"])
-            else:
-                book["TikaIndex"] = None
-
-    # Save to new file
+        names = {book["Index"]: book["FileName"] for book in load_json_records(f)}
 
     temp2_file = os.path.join(output_dir, "temp2_filename.json")
-    with open(temp2_file, "w", encoding="utf-8") as f:
-        json.dump(books_data, f, indent=2, ensure_ascii=False)
-
+    with open(temp1_file, "r", encoding="utf-8") as f:
+        write_chunks_atomic(temp2_file, iter_json_records(_filename_records(load_json_records(f), names)))
     print(f"Created {temp2_file} with filename references")
 
 
+# relation keys as used in tpo_map.json
+_LINK_KEYS = ((CommentaryLevel.Mula, "m"), (CommentaryLevel.Atthakatha, "a"), (CommentaryLevel.Tika, "t"))
+
+
+def catalog_relations(catalog: Catalog) -> Dict[str, Dict[str, List[str]]]:
+    """{FileName: {"m"/"a"/"t": linked filenames}} for every linked book."""
+    names = catalog.table.file_name
+    relations = {}
+    for row, file_name in enumerate(names):
+        links = {}
+        for level, key in _LINK_KEYS:
+            rows = catalog.edges.linked(row, level)
+            if rows:
+                links[key] = [names[r] for r in rows]
+        if links:
+            relations[file_name] = links
+    return relations
+
+
+def catalog_families(catalog: Catalog) -> dict:
+    """{"families": [...], "books": {FileName: nearest books per level}}"""
+    table, families = catalog.table, catalog.families
+    names = table.file_name
+    level_of = catalog.edges.level
+
+    # only linked families are written; ids are positions in this list
+    family_ids: Dict[int, int] = {}
+    family_list = []
+    books = {}
+    for row, file_name in enumerate(names):
+        entry = {}
+        for level, key in _LINK_KEYS:
+            if level_of[row] == level.value:
+                continue
+            targets = families.nearest(row, level)
+            if targets:
+                entry[key] = {
+                    "to": [names[r] for r in targets],
+                    "via": [names[r] for r in families.route(row, level)[1:-1]],
+                }
+        if not entry:
+            continue
+
+        family = families.family_of(row)
+        if family not in family_ids:
+            family_ids[family] = len(family_list)
+            family_list.append(
+                {key: [names[r] for r in families.members(row, level)] for level, key in _LINK_KEYS}
+            )
+        books[file_name] = {"family": family_ids[family], **entry}
+    return {"families": family_list, "books": books}
+
+
+def build_all(catalog: Optional[Catalog] = None):
+    """Bring every output up to date: the temp1/temp2 catalog dumps,
+    books.json, tpo_map.json, tpo_map_min.json, the titles and the index
+    artifacts. Only the outputs whose inputs changed are rebuilt (build.py);
+    a ``catalog`` given here replaces the one the files describe."""
+    from build import build
+
+    return build(values={"catalog": catalog} if catalog else None)
+
+
 if __name__ == "__main__":
-    book_li, books_files = populate_book_list()
-    export_to_json(book_li)
-    convert_indices_to_filenames()
+    # run against the importable modules so tpo_map shares their classes;
+    # the same command line as build.py
+    import build
 
-    import subprocess
-    result = subprocess.run(
-        ["node", "tpo_map.js"], capture_output=True, text=True, check=True
-    )
-    print("\nNode.js script output:")
-    print(result.stdout)
+    sys.exit(build.main())
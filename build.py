@@ -0,0 +1,655 @@
+"""Incremental build of output/
+
+Every artifact is a node of a small graph that names the nodes it reads.
+A node's signature hashes the digests of its inputs and of the build code;
+a node whose signature and files match the last manifest is skipped, and
+the others run on a thread pool as soon as their inputs are ready. Value
+digests give an early cut-off: a one-book nav path change rebuilds the
+titles and maps but not relations.json, whose link view is unchanged.
+
+python3 build.py [build] [target ...] [--dry-run] [--timings]
+python3 build.py watch [target ...]
+python3 build.py validate | lookup FILE ... | timings
+"""
+
+import os
+import sys
+import json
+import difflib
+import argparse
+import time
+import hashlib
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+import books_matn
+import paliscriptconverter
+import tpo_map
+from books_matn import (
+    CATALOG_FILE,
+    OVERRIDES_FILE,
+    catalog_families,
+    catalog_relations,
+    get_json_backend,
+    iter_books_json,
+    iter_filename_records,
+    iter_json_records,
+    load_catalog,
+)
+from atomic_write import OutputWriter, write_atomic
+from paliscriptconverter import TABLES_FILE, get_segment_cache, reload_tables
+
+MANIFEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "build", "manifest.json")
+MANIFEST_VERSION = 1
+
+# the modules whose code shapes the outputs; a change to one rebuilds everything
+CODE_FILES = tuple(
+    os.path.abspath(module.__file__) for module in (books_matn, tpo_map, paliscriptconverter)
+) + (os.path.abspath(__file__),)
+
+
+class Source(NamedTuple):
+    name: str
+    paths: Tuple[str, ...]
+
+
+class Node(NamedTuple):
+    """``run`` gets the values of the ``inputs`` that are nodes (sources are
+    only hashed). Output nodes return {output filename: text, or a callable
+    returning the text in chunks, streamed to the file}; their digest is
+    that of the files written. ``digest`` hashes the value of other nodes;
+    without it the node's digest is its signature."""
+
+    name: str
+    inputs: Tuple[str, ...]
+    run: Callable[..., object]
+    digest: Optional[Callable[[object], str]] = None
+    output: bool = False
+    # the output files, when they are not just the node's name
+    files: Tuple[str, ...] = ()
+
+
+class UnknownTargetError(LookupError):
+    """A build target that names no node and no output file."""
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_digest(paths: Iterable[str]) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(os.path.basename(path).encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _json_digest(value) -> str:
+    return _sha256(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def _file_name_view(catalog) -> str:
+    return _json_digest(catalog.table.file_name)
+
+
+def _nav_view(catalog) -> str:
+    table = catalog.table
+    return _json_digest([table.file_name, table.long_nav_path, table.short_nav_path])
+
+
+def _link_view(catalog) -> str:
+    table = catalog.table
+    return _json_digest(
+        [
+            table.file_name,
+            table.matn.tolist(),
+            table.mula_index.tolist(),
+            table.atthakatha_index.tolist(),
+            table.tika_index.tolist(),
+            sorted((row, level, list(indices)) for (row, level), indices in table.covers.items()),
+            [catalog.jumps.y, catalog.jumps.m, catalog.jumps.a, catalog.jumps.t],
+        ]
+    )
+
+
+def _catalog_view(catalog) -> str:
+    table = catalog.table
+    return _json_digest(
+        [
+            table.index.tolist(),
+            table.file_name,
+            table.long_nav_path,
+            table.short_nav_path,
+            table.matn.tolist(),
+            table.pitaka.tolist(),
+            table.book_type.tolist(),
+            table.mula_index.tolist(),
+            table.atthakatha_index.tolist(),
+            table.tika_index.tolist(),
+            table.chapter_list_types,
+            sorted((row, level, list(indices)) for (row, level), indices in table.covers.items()),
+            [catalog.jumps.y, catalog.jumps.m, catalog.jumps.a, catalog.jumps.t],
+        ]
+    )
+
+
+def _identity(value):
+    return value
+
+
+def _text(file_name: str, make: Callable[..., object], pretty=True):
+    def run(*values) -> Dict[str, str]:
+        return {file_name: get_json_backend().dumps(make(*values), pretty)}
+
+    return run
+
+
+def _profile_node(profile: tpo_map.Profile) -> Node:
+    def run(catalog, titles=None) -> Dict[str, str]:
+        return {profile.file_name: tpo_map.TpoModel(catalog, titles).render(profile)}
+
+    # a profile may select on any column, so it reads the whole catalog
+    inputs = ("catalog", "title_tables") if "title" in profile.fields else ("catalog",)
+    return Node(profile.file_name, inputs, run, output=True)
+
+
+SOURCES = (
+    Source("catalog_file", (CATALOG_FILE,)),
+    Source("overrides_file", (OVERRIDES_FILE,)),
+    Source("converter_tables", (TABLES_FILE,)),
+)
+
+NODES = (
+    Node("catalog", ("catalog_file", "overrides_file"), lambda: load_catalog(), _catalog_view),
+    # views of the catalog, digested on the columns their readers use
+    Node("file_names", ("catalog",), _identity, _file_name_view),
+    Node("nav_paths", ("catalog",), _identity, _nav_view),
+    Node("links", ("catalog",), _identity, _link_view),
+    # the catalog dumps are streamed to their files one book at a time
+    Node(
+        "temp1_indices.json",
+        ("catalog",),
+        lambda catalog: {"temp1_indices.json": lambda: iter_books_json(catalog.table)},
+        output=True,
+    ),
+    Node(
+        "temp2_filename.json",
+        ("catalog",),
+        lambda catalog: {"temp2_filename.json": lambda: iter_json_records(iter_filename_records(catalog.table))},
+        output=True,
+    ),
+    Node(
+        "books.json",
+        ("catalog", "converter_tables"),
+        lambda catalog: {
+            "books.json": lambda: iter_json_records(tpo_map.iter_romanized_books(iter_filename_records(catalog.table)))
+        },
+        output=True,
+    ),
+    Node("title_tables", ("nav_paths", "converter_tables"), tpo_map.title_tables, _json_digest),
+    Node(
+        "titles",
+        ("title_tables",),
+        tpo_map.titles_json,
+        output=True,
+        files=tuple(f"titles/{script}.json" for script in tpo_map.TITLE_SCRIPTS),
+    ),
+    # one node per tpo_map profile, all reading the shared title tables
+    *(_profile_node(profile) for profile in tpo_map.PROFILES),
+    Node("relations.json", ("links",), _text("relations.json", catalog_relations), output=True),
+    Node("families.json", ("links",), _text("families.json", catalog_families), output=True),
+    Node(
+        "filename_hash.json",
+        ("file_names",),
+        _text("filename_hash.json", lambda c: books_matn.FilenameHash.build(c.table.file_name).to_dict(), False),
+        output=True,
+    ),
+)
+
+
+def load_manifest(manifest_file: str = MANIFEST_FILE) -> dict:
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("nodes", {}) if manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def save_manifest(nodes: dict, manifest_file: str = MANIFEST_FILE):
+    manifest = {"version": MANIFEST_VERSION, "nodes": nodes}
+    write_atomic(manifest_file, json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+
+
+class NodeResult(NamedTuple):
+    status: str  # "built", "skipped" or "loaded" (run only to feed a rebuilt node)
+    seconds: float
+
+
+class Build:
+    """One run over the graph; ``run()`` returns a NodeResult per node.
+
+    ``values`` stand in for their nodes (e.g. a catalog built in memory) and
+    are signed with the node's digest of the value, so their outputs are
+    rebuilt whenever the value differs from the last build's.
+    """
+
+    def __init__(
+        self,
+        nodes: Iterable[Node] = NODES,
+        sources: Iterable[Source] = SOURCES,
+        output_dir: str = books_matn.output_dir,
+        manifest_file: str = MANIFEST_FILE,
+        values: Optional[Mapping[str, object]] = None,
+        jobs: Optional[int] = None,
+        warm: Optional[Mapping[str, Tuple[str, object]]] = None,
+    ):
+        self.nodes = {node.name: node for node in nodes}
+        self._node_by_file = {
+            file_name: node.name
+            for node in self.nodes.values()
+            if node.output
+            for file_name in node.files or (node.name,)
+        }
+        self.sources = {source.name: source for source in sources}
+        self.output_dir = output_dir
+        self.manifest_file = manifest_file
+        self.jobs = jobs or os.cpu_count() or 1
+        self._values: Dict[str, object] = dict(values or {})
+        # values handed in stand for their node: signed by their own digest
+        self._supplied = frozenset(self._values)
+        for name in self._supplied:
+            if self.nodes[name].digest is None:
+                raise ValueError(f"node {name!r} has no digest, so its value cannot be supplied")
+        self._locks = {name: threading.Lock() for name in self.nodes}
+        self._digests: Dict[str, str] = {}
+        self._entries: Dict[str, dict] = {}
+        self._writer: Optional[OutputWriter] = None
+        # {name: (signature, value)} of an earlier Build; reused while the signature holds
+        self._warm = dict(warm or {})
+        self.signatures: Dict[str, str] = {}
+        self.results: Dict[str, NodeResult] = {}
+
+    def closure(self, targets: Optional[Iterable[str]] = None) -> List[str]:
+        """``targets`` (node names or output files, e.g. "titles/ro.json")
+        and every node they read, in dependency order."""
+        order: List[str] = []
+        state: Dict[str, int] = {}
+
+        def visit(name: str):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"build graph cycle at {name}")
+            state[name] = 1
+            for dep in self.nodes[name].inputs:
+                if dep in self.nodes:
+                    visit(dep)
+            state[name] = 2
+            order.append(name)
+
+        for name in self.nodes if targets is None else targets:
+            if name not in self.nodes:
+                if name not in self._node_by_file:
+                    raise UnknownTargetError(f"unknown build target {name!r}")
+                name = self._node_by_file[name]
+            visit(name)
+        return order
+
+    def _value(self, name: str):
+        node = self.nodes[name]
+        with self._locks[name]:
+            if name not in self._values:
+                start = time.perf_counter()
+                args = [self._value(dep) for dep in node.inputs if dep in self.nodes]
+                self._values[name] = node.run(*args)
+                self.results[name] = NodeResult("loaded", time.perf_counter() - start)
+            return self._values[name]
+
+    def _files_match(self, files: Mapping[str, str]) -> bool:
+        for file_name, digest in files.items():
+            try:
+                with open(os.path.join(self.output_dir, file_name), "rb") as f:
+                    if _sha256(f.read()) != digest:
+                        return False
+            except OSError:
+                return False
+        return bool(files)
+
+    def _write(self, texts: Mapping[str, object]) -> Dict[str, str]:
+        """Write an output node's files; returns {file name: sha256}."""
+        futures = {}
+        for file_name, text in texts.items():
+            path = os.path.join(self.output_dir, file_name)
+            if isinstance(text, str):
+                data = text.encode("utf-8")
+                futures[file_name] = path, self._writer.submit_bytes(path, data), _sha256(data)
+            else:
+                futures[file_name] = path, self._writer.submit_chunks(path, text), None
+        files = {}
+        for file_name, (path, future, digest) in futures.items():
+            written = future.result()
+            if digest is None:
+                written, digest = written
+            print(f"{path}: {'saved successfully' if written else 'unchanged'}.")
+            files[file_name] = digest
+        return files
+
+    def _run_node(self, name: str, code: str, previous: Mapping[str, dict], waits: List[Future]):
+        for wait in waits:
+            wait.result()
+        node = self.nodes[name]
+        start = time.perf_counter()
+        if name in self._supplied:
+            signature = _json_digest([name, code, "supplied", node.digest(self._values[name])])
+        else:
+            signature = _json_digest([name, code] + [self._digests[dep] for dep in node.inputs])
+        self.signatures[name] = signature
+        warm = self._warm.get(name)
+        if warm and warm[0] == signature:
+            with self._locks[name]:
+                self._values.setdefault(name, warm[1])
+        old = previous.get(name)
+        if (
+            old
+            and old["signature"] == signature
+            and (not node.output or self._files_match(old.get("files", {})))
+        ):
+            self._digests[name] = old["digest"]
+            self._entries[name] = old
+            self.results[name] = NodeResult("skipped", time.perf_counter() - start)
+            return
+
+        value = self._value(name)
+        entry = {"signature": signature}
+        if node.output:
+            entry["files"] = self._write(value)
+            digest = _json_digest(sorted(entry["files"].items()))
+        else:
+            digest = node.digest(value) if node.digest else signature
+        entry["digest"] = digest
+        seconds = time.perf_counter() - start
+        entry["seconds"] = round(seconds, 4)
+        self._digests[name] = digest
+        self._entries[name] = entry
+        self.results[name] = NodeResult("built", seconds)
+
+    def _hash_sources(self, order: Iterable[str]):
+        for name in {dep for node in order for dep in self.nodes[node].inputs}:
+            if name in self.sources:
+                self._digests[name] = _file_digest(self.sources[name].paths)
+
+    def plan(self, targets: Optional[Iterable[str]] = None) -> Dict[str, Optional[float]]:
+        """Dry run: the nodes of the closure of ``targets`` that would run,
+        with the seconds each took last time (None if never built). A node
+        is listed when it or one of its inputs changed; at run time value
+        digests may still cut some of them off."""
+        order = self.closure(targets)
+        previous = load_manifest(self.manifest_file)
+        code = _file_digest(CODE_FILES)
+        self._hash_sources(order)
+        stale: Dict[str, Optional[float]] = {}
+        digests = dict(self._digests)
+        for name in order:
+            node = self.nodes[name]
+            old = previous.get(name)
+            if name in self._supplied:
+                signature = _json_digest([name, code, "supplied", node.digest(self._values[name])])
+            elif any(dep in stale for dep in node.inputs):
+                signature = None
+            else:
+                signature = _json_digest([name, code] + [digests[dep] for dep in node.inputs])
+            if (
+                old
+                and old["signature"] == signature
+                and (not node.output or self._files_match(old.get("files", {})))
+            ):
+                digests[name] = old["digest"]
+            else:
+                stale[name] = old.get("seconds") if old else None
+        return stale
+
+    def run(self, targets: Optional[Iterable[str]] = None) -> Dict[str, NodeResult]:
+        order = self.closure(targets)
+        previous = load_manifest(self.manifest_file)
+        code = _file_digest(CODE_FILES)
+        self._hash_sources(order)
+        # a long-lived process (watch) must not convert with stale tables
+        reload_tables()
+
+        futures: Dict[str, Future] = {}
+        with OutputWriter() as self._writer, ThreadPoolExecutor(self.jobs) as pool:
+            # submitted in dependency order, so a node only waits on started ones
+            for name in order:
+                waits = [futures[dep] for dep in self.nodes[name].inputs if dep in futures]
+                futures[name] = pool.submit(self._run_node, name, code, previous, waits)
+        for future in futures.values():
+            future.result()
+
+        if any(result.status != "skipped" for result in self.results.values()):
+            kept = {name: entry for name, entry in previous.items() if name in self.nodes}
+            save_manifest({**kept, **self._entries}, self.manifest_file)
+            get_segment_cache().save()
+        return self.results
+
+    def warm_values(self) -> Dict[str, Tuple[str, object]]:
+        """The values this run holds, for the ``warm`` of the next Build."""
+        return {name: (self.signatures[name], value) for name, value in self._values.items() if name in self.signatures}
+
+
+def build(targets: Optional[Iterable[str]] = None, **options) -> Dict[str, NodeResult]:
+    """Bring ``targets`` (default: every node) up to date; see Build."""
+    return Build(**options).run(targets)
+
+
+class Watcher:
+    """Rebuild ``targets`` whenever a source file changes.
+
+    The sources are polled every ``interval`` seconds; a change starts a
+    quiet period of ``debounce`` seconds that every further change restarts,
+    so a burst of saves gives one build. Node values are kept between builds
+    (Build ``warm``): an edit only recomputes the nodes whose inputs changed.
+    """
+
+    def __init__(
+        self,
+        targets: Optional[Iterable[str]] = None,
+        interval: float = 0.1,
+        debounce: float = 0.2,
+        sources: Iterable[Source] = SOURCES,
+        **options,
+    ):
+        self.targets = list(targets) if targets is not None else None
+        self.interval = interval
+        self.debounce = debounce
+        self.paths = tuple(path for source in sources for path in source.paths)
+        self.options = dict(options, sources=sources)
+        self._warm: Dict[str, Tuple[str, object]] = {}
+
+    def _stamp(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        stamps = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                stamps.append(None)
+            else:
+                stamps.append((st.st_mtime_ns, st.st_size))
+        return tuple(stamps)
+
+    def rebuild(self) -> Dict[str, NodeResult]:
+        run = Build(warm=self._warm, **self.options)
+        results = run.run(self.targets)
+        self._warm = run.warm_values()
+        return results
+
+    def _report(self, changed: float):
+        start = time.perf_counter()
+        try:
+            results = self.rebuild()
+        except books_matn.CatalogError as e:
+            print(f"build failed: {e}", file=sys.stderr)
+            return
+        except Exception:
+            # keep watching: the next save may fix it
+            traceback.print_exc()
+            print("build failed", file=sys.stderr)
+            return
+        end = time.perf_counter()
+        built = [name for name, r in results.items() if r.status == "built"]
+        print(
+            f"{len(built)} built in {(end - start) * 1000:.0f} ms"
+            f" ({(end - changed) * 1000:.0f} ms after the change): {', '.join(built) or 'nothing'}"
+        )
+
+    def run(self):
+        """Build once, then watch until interrupted."""
+        self._report(time.perf_counter())
+        stamp = self._stamp()
+        print(f"watching {', '.join(os.path.basename(path) for path in self.paths)}")
+        while True:
+            time.sleep(self.interval)
+            current = self._stamp()
+            if current == stamp:
+                continue
+            changed = time.perf_counter()
+            while True:
+                stamp = current
+                time.sleep(self.debounce)
+                current = self._stamp()
+                if current == stamp:
+                    break
+                changed = time.perf_counter()
+            self._report(changed)
+
+
+def _print_timings(rows: Iterable[Tuple[str, str, Optional[float]]]):
+    for name, status, seconds in rows:
+        cost = "?" if seconds is None else f"{seconds * 1000:.1f} ms"
+        print(f"{name:<24} {status:<8} {cost:>10}")
+
+
+def _cmd_build(args) -> int:
+    if args.dry_run:
+        stale = Build().plan(args.targets or None)
+        _print_timings((name, "stale", seconds) for name, seconds in stale.items())
+        known = [seconds for seconds in stale.values() if seconds is not None]
+        print(f"{len(stale)} to build, about {sum(known) * 1000:.0f} ms by the last build")
+        return 0
+
+    start = time.perf_counter()
+    results = build(args.targets or None, jobs=args.jobs)
+    if args.timings:
+        _print_timings((name, r.status, r.seconds) for name, r in results.items())
+    counts = {status: sum(r.status == status for r in results.values()) for status in ("built", "loaded", "skipped")}
+    print(
+        f"{counts['built']} built, {counts['loaded']} loaded, {counts['skipped']} up to date"
+        f" in {(time.perf_counter() - start) * 1000:.0f} ms"
+    )
+    return 0
+
+
+def _cmd_timings(args) -> int:
+    """Node timings recorded by the last build of each node."""
+    manifest = load_manifest()
+    order = Build().closure(args.targets or None)
+    _print_timings((name, "built" if name in manifest else "never", manifest.get(name, {}).get("seconds")) for name in order)
+    return 0
+
+
+def _cmd_validate(args) -> int:
+    try:
+        overrides = books_matn.load_overrides(args.overrides)
+        table = books_matn.BookTable.load(args.catalog)
+    except books_matn.CatalogError as e:
+        print(e, file=sys.stderr)
+        return 1
+    errors = books_matn.validate_catalog(table, overrides)
+    for error in errors:
+        print(error, file=sys.stderr)
+    print(f"{args.catalog}: {len(table)} books, {len(overrides)} overrides, {len(errors)} error(s)")
+    return 1 if errors else 0
+
+
+def _cmd_lookup(args) -> int:
+    from snapshot import get_snapshot
+
+    entries = get_snapshot().tpo_map
+    found = {}
+    for file_name in args.files:
+        if file_name in entries:
+            found[file_name] = entries[file_name]
+            continue
+        close = difflib.get_close_matches(file_name, entries, n=3)
+        hint = f"; did you mean {', '.join(close)}?" if close else ""
+        print(f"unknown file {file_name}{hint}", file=sys.stderr)
+    if found:
+        print(get_json_backend().dumps(found, pretty=True))
+    return 0 if len(found) == len(args.files) else 1
+
+
+def _cmd_watch(args) -> int:
+    try:
+        Watcher(args.targets or None, args.interval, args.debounce, jobs=args.jobs).run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+COMMANDS = ("build", "watch", "timings", "validate", "lookup")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """``python3 build.py [command] ...``; without a command it builds, so
+    ``python3 build.py tpo_map_min.json`` still works."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv.insert(0, "build")
+
+    parser = argparse.ArgumentParser(prog="build.py", description="Build and inspect output/.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    targets_help = "nodes or output files to build, with their inputs (default: all)"
+
+    cmd = commands.add_parser("build", help="bring outputs up to date")
+    cmd.add_argument("targets", nargs="*", help=targets_help)
+    cmd.add_argument("-n", "--dry-run", action="store_true", help="list what would be built and its last cost")
+    cmd.add_argument("-t", "--timings", action="store_true", help="print the time of each node")
+    cmd.add_argument("-j", "--jobs", type=int, help="worker threads (default: CPU count)")
+    cmd.set_defaults(func=_cmd_build)
+
+    cmd = commands.add_parser("watch", help="rebuild when the catalog, overrides or converter tables change")
+    cmd.add_argument("targets", nargs="*", help=targets_help)
+    cmd.add_argument("--interval", type=float, default=0.1, help="seconds between polls (default: 0.1)")
+    cmd.add_argument("--debounce", type=float, default=0.2, help="quiet seconds before a build (default: 0.2)")
+    cmd.add_argument("-j", "--jobs", type=int, help="worker threads (default: CPU count)")
+    cmd.set_defaults(func=_cmd_watch)
+
+    cmd = commands.add_parser("timings", help="node timings of the last builds")
+    cmd.add_argument("targets", nargs="*", help=targets_help)
+    cmd.set_defaults(func=_cmd_timings)
+
+    cmd = commands.add_parser("validate", help="check the catalog and the overrides")
+    cmd.add_argument("--catalog", default=CATALOG_FILE)
+    cmd.add_argument("--overrides", default=OVERRIDES_FILE)
+    cmd.set_defaults(func=_cmd_validate)
+
+    cmd = commands.add_parser("lookup", help="print the tpo_map entries of filenames")
+    cmd.add_argument("files", nargs="+")
+    cmd.set_defaults(func=_cmd_lookup)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except (UnknownTargetError, books_matn.JsonBackendError) as e:
+        parser.error(str(e))
+    except books_matn.CatalogError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,545 @@
+"""Pāli script converter, ported from script/paliscriptconverter.js
+
+https://github.com/pnfo/pali-script-converter
+Attribution-NonCommercial-ShareAlike 4.0 International
+
+Like the JS converter, text goes through Sinhala: ``convert_to_sinh`` then
+``convert_from_sinh``. The character tables are in
+script/paliscriptconverter.json; each (from, to) pair is compiled once into
+a ``str.translate`` map or a longest-first regex alternation, so a
+conversion is a single scan instead of the JS per-call Map rebuild.
+
+python3 paliscriptconverter.py --check    # compare with the JS converter (needs node)
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import threading
+import subprocess
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+TABLES_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "script", "paliscriptconverter.json"
+)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "translit")
+
+# bump when a conversion step changes, so persisted segments are not reused
+CACHE_VERSION = 1
+
+# Script keys in table column order, as CVT.Script in the JS converter
+SCRIPTS = (
+    "SI", "HI", "RO", "THAI", "LAOS", "MY", "KM", "BENG", "GURM",
+    "THAM", "GUJA", "TELU", "KANN", "MALA", "BRAH", "TIBT", "CYRL",
+)
+
+
+# (digest, tables) of TABLES_FILE as last read; everything compiled from the
+# tables below is dropped by reload_tables() when the file changes
+_tables_state: Optional[Tuple[str, dict]] = None
+_tables_lock = threading.Lock()
+
+
+def _read_tables(known_digest: Optional[str] = None) -> Optional[Tuple[str, dict]]:
+    """(digest, tables) of TABLES_FILE; None when its digest is ``known_digest``."""
+    with open(TABLES_FILE, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data + b"v%d" % CACHE_VERSION).hexdigest()
+    if digest == known_digest:
+        return None
+    tables = json.loads(data)
+    if tuple(tables["scripts"]) != SCRIPTS:
+        raise ValueError(f"{TABLES_FILE}: unexpected script columns")
+    return digest, tables
+
+
+def _loaded_tables() -> Tuple[str, dict]:
+    global _tables_state
+    if _tables_state is None:
+        with _tables_lock:
+            if _tables_state is None:
+                _tables_state = _read_tables()
+    return _tables_state
+
+
+def _tables() -> dict:
+    return _loaded_tables()[1]
+
+
+def _tables_digest() -> str:
+    return _loaded_tables()[0]
+
+
+def script_key(script: str) -> str:
+    """Normalise "hi", "Ro", ... to the SCRIPTS key."""
+    key = script.upper()
+    if key not in SCRIPTS:
+        raise ValueError(f"unknown script {script!r}")
+    return key
+
+
+class _CharMap:
+    """Longest-match replacement over one table pair, compiled once."""
+
+    __slots__ = ("_translate", "_pattern", "_mapping")
+
+    def __init__(self, mapping: Dict[str, str]):
+        self._mapping = mapping
+        if all(len(key) == 1 for key in mapping):
+            self._translate = {ord(key): value for key, value in mapping.items()}
+            self._pattern = None
+        else:
+            # alternation is tried in order, so longest keys first = longest match
+            keys = sorted(mapping, key=len, reverse=True)
+            self._translate = None
+            self._pattern = re.compile("|".join(map(re.escape, keys)))
+
+    def __call__(self, text: str) -> str:
+        if self._pattern is None:
+            return text.translate(self._translate)
+        mapping = self._mapping
+        return self._pattern.sub(lambda m: mapping[m.group()], text)
+
+
+@lru_cache(maxsize=None)
+def _char_map(src: int, dst: int, with_signs: bool = True) -> _CharMap:
+    # later rows win, as in the JS Map
+    tables = _tables()
+    rows = tables["consonants"] + tables["vowels"] + (tables["signs"] if with_signs else [])
+    return _CharMap({row[src]: row[dst] for row in rows if row[src]})
+
+
+def _replacer(pattern: str, repl) -> Callable[[str], str]:
+    compiled = re.compile(pattern)
+    return lambda text: compiled.sub(repl, text)
+
+
+def _chain(*steps: Callable[[str], str]) -> Callable[[str], str]:
+    def run(text: str) -> str:
+        for step in steps:
+            text = step(text)
+        return text
+
+    return run
+
+
+def _literal(*pairs: Tuple[str, str]) -> Callable[[str], str]:
+    def run(text: str) -> str:
+        for old, new in pairs:
+            text = text.replace(old, new)
+        return text
+
+    return run
+
+
+# JavaScript's \s, which differs from Python's for a few code points
+_JS_SPACE = "\t\n\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff"
+
+_remove_zwj = _literal(("\u200c", ""), ("\u200d", ""))
+
+_beautify_common = _chain(
+    _literal(("\u0970\u2026", "\u2026"), ("\u0970", "\u00b7"), ("\u0964", "."), ("\u0965", ".")),
+    _replacer(f"[{_JS_SPACE}]([{_JS_SPACE},!;?.])", r"\1"),
+)
+
+_swap_e_o = {
+    "THAI": _replacer(r"([\u0e01-\u0e2e])([\u0e40\u0e42])", r"\2\1"),
+    "LAOS": _replacer(r"([\u0e81-\u0eae])([\u0ec0\u0ec2])", r"\2\1"),
+}
+_un_swap_e_o = {
+    "THAI": _replacer(r"([\u0e40\u0e42])([\u0e01-\u0e2e])", r"\2\1"),
+    "LAOS": _replacer(r"([\u0ec0\u0ec2])([\u0e81-\u0eae])", r"\2\1"),
+}
+
+
+def _add_inherent_a(a: str) -> Callable[[str], str]:
+    # twice, because a match consumes the consonant that follows
+    no_vowel = re.compile(f"([\u0d9a-\u0dc6])([^\u0dcf-\u0ddf\u0dca{a}])")
+    at_end = re.compile("([\u0d9a-\u0dc6])\\Z")
+    repl = "\\1" + a + "\\2"
+
+    def run(text: str) -> str:
+        text = no_vowel.sub(repl, text)
+        text = no_vowel.sub(repl, text)
+        return at_end.sub("\\1" + a, text)
+
+    return run
+
+
+_VOWEL_SIGN = {
+    "\u0d85": "", "\u0d86": "\u0dcf", "\u0d89": "\u0dd2", "\u0d8a": "\u0dd3",
+    "\u0d8b": "\u0dd4", "\u0d8c": "\u0dd6", "\u0d91": "\u0dd9", "\u0d94": "\u0ddc",
+}
+_CONSONANT_BEFORE_NON_VOWEL = re.compile("([\u0d9a-\u0dc6])([^\u0d85\u0d86\u0d89\u0d8a\u0d8b\u0d8c\u0d91\u0d94\u0dca])")
+_CONSONANT_AT_END = re.compile("([\u0d9a-\u0dc6])\\Z")
+_CONSONANT_BEFORE_VOWEL = re.compile("([\u0d9a-\u0dc6])([\u0d85\u0d86\u0d89\u0d8a\u0d8b\u0d8c\u0d91\u0d94])")
+
+
+def _independent_to_signs(text: str) -> str:
+    text = _CONSONANT_BEFORE_NON_VOWEL.sub("\\1\u0dca\\2", text)
+    text = _CONSONANT_BEFORE_NON_VOWEL.sub("\\1\u0dca\\2", text)
+    text = _CONSONANT_AT_END.sub("\\1\u0dca", text)
+    return _CONSONANT_BEFORE_VOWEL.sub(lambda m: m.group(1) + _VOWEL_SIGN[m.group(2)], text)
+
+
+_TIBT_SUBJOIN = re.compile("\u0f84([\u0f40-\u0f67])")
+
+
+def _tibetan_subjoined(text: str) -> str:
+    return _TIBT_SUBJOIN.sub(lambda m: chr(ord(m.group(1)) + 0x50), text)
+
+
+# N in the JS converter: clean-up before conversion to Sinhala
+_BEFORE_TO_SINH = {
+    "SI": (
+        _remove_zwj,
+        _literal(("\u0d92", "\u0d91"), ("\u0d95", "\u0d94"), ("\u0dda", "\u0dd9"), ("\u0ddd", "\u0ddc")),
+    ),
+    "HI": (_remove_zwj,),
+    "RO": (str.lower,),
+    "THAI": (
+        _literal(("\u0e0e", "\u0e0f"), ("\u0e36", "\u0e34\u0e4d"), ("\uf70f", "\u0e0d"), ("\uf700", "\u0e10")),
+        _un_swap_e_o["THAI"],
+    ),
+    "LAOS": (_un_swap_e_o["LAOS"],),
+    "KM": (_literal(("\u17b9", "\u17b7\u17c6"), ("\u17d1", "\u17d2")),),
+    "MY": (
+        _literal(
+            ("\u102b", "\u102c"), ("\u103e", "\u1039\u101f"), ("\u103d", "\u1039\u101d"),
+            ("\u103c", "\u1039\u101b"), ("\u103b", "\u1039\u101a"), ("\u103a", ""),
+            ("\u103f", "\u101e\u1039\u101e"), ("\u100a", "\u1009\u1039\u1009"),
+            ("\u101e\u1036\u1003", "\u101e\u1004\u1039\u1003"), ("\u104a", ","), ("\u104b", "."),
+        ),
+    ),
+}
+
+# I in the JS converter: script specific clean-up after conversion from Sinhala
+_BEAUTIFY = {
+    "SI": (_replacer("\u0dca([\u0dba\u0dbb])", "\u0dca\u200d\\1"), _beautify_common),
+    "RO": (_beautify_common,),
+    "THAI": (
+        _swap_e_o["THAI"],
+        _literal(("\u0e34\u0e4d", "\u0e36"), ("\u0e0d", "\uf70f"), ("\u0e10", "\uf700")),
+        _beautify_common,
+    ),
+    "LAOS": (_swap_e_o["LAOS"], _beautify_common),
+    "MY": (
+        _literal((",", "\u104a"), (";", "\u104a")),
+        _replacer("[\u2026\u0964\u0965]+", "\u104b"),
+        _literal(("\u1009\u1039\u1009", "\u100a"), ("\u101e\u1039\u101e", "\u103f")),
+        _replacer("\u1004\u1039([\u1000-\u1020])", "\u1004\u103a\u1039\\1"),
+        _literal(
+            ("\u1039\u101a", "\u103b"), ("\u1039\u101b", "\u103c"),
+            ("\u1039\u101d", "\u103d"), ("\u1039\u101f", "\u103e"),
+        ),
+        _replacer("([\u1001\u1002\u1004\u1012\u1015\u101d]\u1031?)\u102c", "\\1\u102b"),
+        _replacer(
+            "(\u1000\u1039\u1001|\u1014\u1039\u1012|\u1015\u1039\u1015|\u1019\u1039\u1015)(\u1031?)\u102b",
+            "\\1\\2\u102c",
+        ),
+        # drops the e vowel sign, as the JS converter does
+        _replacer("(\u1012\u1039\u1013|\u1012\u103d)(\u1031?)\u102c", "\\1\u102b"),
+        _beautify_common,
+    ),
+    "KM": (_beautify_common,),
+    "THAM": (
+        _literal(
+            ("\u1a60\u1a41", "\u1a55"), ("\u1a48\u1a60\u1a48", "\u1a54"),
+            ("\u0964", "\u1aa8"), ("\u0965", "\u1aa9"),
+        ),
+    ),
+    "GUJA": (_beautify_common,),
+    "TELU": (_beautify_common,),
+    "MALA": (_beautify_common,),
+    "BRAH": (
+        _literal(("\u0964", "\U00011047"), ("\u0965", "\U00011048"), ("\u2013", "\U0001104b")),
+        _beautify_common,
+    ),
+    "TIBT": (
+        _literal(("\u0964", "\u0f0d"), ("\u0965", "\u0f0e")),
+        _tibetan_subjoined,
+        _literal(
+            ("\u0f61\u0fb1", "\u0f61\u0fbb"), ("\u0f5d\u0fad", "\u0f5d\u0fba"),
+            ("\u0f5b\u0fac", "\u0f5b\u0f84\u0f5c"), ("\u0f61\u0fb7", "\u0f61\u0f84\u0f67"),
+            ("\u0f5d\u0fb7", "\u0f5d\u0f84\u0f67"),
+        ),
+    ),
+    "CYRL": (_beautify_common,),
+}
+
+
+@lru_cache(maxsize=None)
+def _to_sinh_steps(key: str) -> Tuple[Callable[[str], str], ...]:
+    src = SCRIPTS.index(key)
+    if key == "SI":
+        basic = ()
+    elif key == "RO":
+        basic = (_char_map(src, 0, False), _literal(("ṁ", "\u0d82")), _independent_to_signs)
+    elif key == "CYRL":
+        basic = (_char_map(src, 0, False), _independent_to_signs)
+    else:
+        basic = (_char_map(src, 0),)
+    return _BEFORE_TO_SINH.get(key, ()) + basic
+
+
+@lru_cache(maxsize=None)
+def _from_sinh_steps(key: str) -> Tuple[Callable[[str], str], ...]:
+    dst = SCRIPTS.index(key)
+    if key == "SI":
+        basic = ()
+    elif key in ("RO", "CYRL"):
+        basic = (_add_inherent_a("\u0430" if key == "CYRL" else "a"), _char_map(0, dst))
+    else:
+        basic = (_char_map(0, dst),)
+    return basic + _BEAUTIFY.get(key, ())
+
+
+class Converter:
+    """Compiled ``from_script`` -> ``to_script`` conversion (via Sinhala)."""
+
+    __slots__ = ("from_script", "to_script", "_steps")
+
+    def __init__(self, from_script: str, to_script: str):
+        self.from_script = script_key(from_script)
+        self.to_script = script_key(to_script)
+        self._steps = _to_sinh_steps(self.from_script) + _from_sinh_steps(self.to_script)
+
+    def __call__(self, text: str) -> str:
+        for step in self._steps:
+            text = step(text)
+        return text
+
+    def many(self, texts: Iterable[str]) -> List[str]:
+        """Convert a batch; repeated strings are converted once."""
+        done: Dict[str, str] = {}
+        out = []
+        for text in texts:
+            converted = done.get(text)
+            if converted is None:
+                converted = done[text] = self(text)
+            out.append(converted)
+        return out
+
+
+@lru_cache(maxsize=None)
+def get_converter(from_script: str, to_script: str) -> Converter:
+    return Converter(from_script, to_script)
+
+
+def convert_to_sinh(text: str, script: str) -> str:
+    for step in _to_sinh_steps(script_key(script)):
+        text = step(text)
+    return text
+
+
+def convert_from_sinh(text: str, script: str) -> str:
+    for step in _from_sinh_steps(script_key(script)):
+        text = step(text)
+    return text
+
+
+def convert(text: str, from_script: str, to_script: str) -> str:
+    return get_converter(from_script, to_script)(text)
+
+
+def convert_many(texts: Iterable[str], from_script: str, to_script: str) -> List[str]:
+    return get_converter(from_script, to_script).many(texts)
+
+
+class SegmentCache:
+    """Transliterated path segments keyed by (segment, from, to).
+
+    An LRU of at most ``maxsize`` segments in memory over a store in
+    ``cache_dir``, one JSON file per script pair, so processes converting
+    different pairs never write the same file. A pair's file is read into
+    the LRU when the pair is first used; ``save()`` merges the segments
+    converted since the last save into it. A segment evicted from the LRU
+    is converted again, which costs less than reading the file back. The
+    store lives under the digest of the tables and CACHE_VERSION, so a table
+    change starts a fresh one. Nav paths convert segment by segment ("/"
+    never takes part in a rule), so a path only costs the segments not seen
+    before.
+    """
+
+    def __init__(self, maxsize: int = 8192, cache_dir: Optional[str] = CACHE_DIR):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        # the tables the segments are converted with; see reload_tables()
+        self.digest = _tables_digest()
+        self.hits = self.misses = 0
+        self._lru: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._loaded: Set[Tuple[str, str]] = set()
+        # {(from, to): {segment: converted}} not saved yet
+        self._new: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def cache_file(self, from_script: str, to_script: str) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, self.digest[:16], f"{from_script}-{to_script}.json")
+
+    def _read(self, from_script: str, to_script: str) -> Dict[str, str]:
+        cache_file = self.cache_file(from_script, to_script)
+        if cache_file is None:
+            return {}
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _put(self, key: Tuple[str, str, str], converted: str):
+        self._lru[key] = converted
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    def segment(self, segment: str, from_script: str, to_script: str) -> str:
+        from_script, to_script = script_key(from_script), script_key(to_script)
+        key = (segment, from_script, to_script)
+        with self._lock:
+            converted = self._lru.get(key)
+            if converted is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return converted
+            pair = (from_script, to_script)
+            if pair not in self._loaded:
+                self._loaded.add(pair)
+                for stored, stored_converted in self._read(*pair).items():
+                    self._put((stored, *pair), stored_converted)
+                converted = self._lru.get(key)
+            if converted is None:
+                converted = self._new.get(pair, {}).get(segment)
+            if converted is None:
+                self.misses += 1
+                converted = convert(segment, from_script, to_script)
+                if self.cache_dir is not None:
+                    self._new.setdefault(pair, {})[segment] = converted
+            else:
+                self.hits += 1
+            self._put(key, converted)
+        return converted
+
+    def path(self, path: str, from_script: str, to_script: str, sep: str = "/") -> str:
+        return sep.join(self.segment(part, from_script, to_script) for part in path.split(sep))
+
+    def paths(self, paths: Iterable[str], from_script: str, to_script: str, sep: str = "/") -> List[str]:
+        return [self.path(path, from_script, to_script, sep) for path in paths]
+
+    def save(self) -> int:
+        """Merge the new segments into their pair files; returns how many
+        files were written."""
+        if self.cache_dir is None:
+            return 0
+        with self._lock:
+            new, self._new = self._new, {}
+            for (from_script, to_script), segments in new.items():
+                stored = self._read(from_script, to_script)
+                stored.update(segments)
+                cache_file = self.cache_file(from_script, to_script)
+                os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+                tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(stored, f, ensure_ascii=False)
+                os.replace(tmp_file, cache_file)
+        return len(new)
+
+
+_segment_cache: Optional[SegmentCache] = None
+_segment_cache_lock = threading.Lock()
+
+
+def get_segment_cache() -> SegmentCache:
+    """Process-wide segment cache, persisted under CACHE_DIR."""
+    global _segment_cache
+    if _segment_cache is None:
+        with _segment_cache_lock:
+            if _segment_cache is None:
+                _segment_cache = SegmentCache()
+    return _segment_cache
+
+
+def reload_tables() -> bool:
+    """Re-read TABLES_FILE. When it changed, the compiled maps, converters
+    and the process-wide segment cache are dropped (the segments already
+    converted are saved under the old digest first), so nothing made from
+    the old tables is used again. Returns whether the tables changed."""
+    global _tables_state, _segment_cache
+    with _tables_lock:
+        loaded = _read_tables(_tables_state[0] if _tables_state else None)
+        if loaded is None:
+            return False
+        for cached in (_char_map, _to_sinh_steps, _from_sinh_steps, get_converter):
+            cached.cache_clear()
+        _tables_state = loaded
+    with _segment_cache_lock:
+        old, _segment_cache = _segment_cache, None
+    if old is not None:
+        old.save()
+    return True
+
+
+def convert_path(path: str, from_script: str, to_script: str) -> str:
+    """``convert`` for a "/"-separated nav path, through the segment cache."""
+    return get_segment_cache().path(path, from_script, to_script)
+
+
+_JS_CHECK = """
+const CVT = require(process.argv[1]);
+const cases = JSON.parse(require("fs").readFileSync(0, "utf8"));
+const P = CVT.TextProcessor, S = CVT.Script;
+console.log(JSON.stringify(cases.map(([text, from, to]) =>
+    P.convertFromSinh(P.convertToSinh(text, S[from]), S[to]))));
+"""
+
+
+def check_against_js(texts: Iterable[str], node: str = "node") -> List[Tuple[str, str, str, str, str]]:
+    """Convert ``texts`` (Devanagari) HI -> every script -> SI/RO/HI with both
+    converters; returns the (text, from, to, python, js) mismatches."""
+    texts = sorted(set(texts))
+    cases = [(text, "HI", script) for script in SCRIPTS for text in texts]
+    cases += [
+        (rendered, script, dst)
+        for script in SCRIPTS
+        for rendered in convert_many(texts, "HI", script)
+        for dst in ("SI", "RO", "HI")
+    ]
+    js_file = os.path.join(os.path.dirname(TABLES_FILE), "paliscriptconverter.js")
+    js = json.loads(
+        subprocess.run(
+            [node, "-e", _JS_CHECK, js_file],
+            input=json.dumps(cases), capture_output=True, text=True, check=True,
+        ).stdout
+    )
+    if len(js) != len(cases):
+        raise RuntimeError(f"node returned {len(js)} results for {len(cases)} cases")
+    mismatches = []
+    for (text, src, dst), expected in zip(cases, js):
+        got = convert(text, src, dst)
+        if got != expected:
+            mismatches.append((text, src, dst, got, expected))
+    return mismatches
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["--check"]:
+        sys.exit(__doc__)
+    from books_matn import get_catalog
+
+    table = get_catalog().table
+    paths = [p for column in (table.long_nav_path, table.short_nav_path) for p in column if p]
+    mismatches = check_against_js(paths)
+    cache = SegmentCache(cache_dir=None)
+    for script in SCRIPTS:
+        for path in paths:
+            if cache.path(path, "HI", script) != convert(path, "HI", script):
+                mismatches.append((path, "HI", script, cache.path(path, "HI", script), "(whole path)"))
+    for text, src, dst, got, expected in mismatches[:20]:
+        print(f"{src}->{dst} {text!r}: {got!r} != {expected!r}")
+    print(f"{len(mismatches)} mismatches")
+    sys.exit(1 if mismatches else 0)
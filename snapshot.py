@@ -0,0 +1,139 @@
+"""Warm-start snapshot of the derived catalog state
+
+Everything a lookup process derives at startup (the indexed catalog, the
+filename hash, the relations, the title tables in every script and the
+tpo_map entries) is pickled into one file named after the hash of its
+inputs: the catalog, the overrides, the converter tables and the code.
+A process loads it with one read; when an input changes the key changes
+and the snapshot is rebuilt on first use.
+
+python3 snapshot.py    # build or refresh the snapshot
+"""
+
+import os
+import time
+import pickle
+import hashlib
+import threading
+from types import MappingProxyType
+from typing import Dict, NamedTuple, Optional
+
+import books_matn
+import paliscriptconverter
+import tpo_map
+from books_matn import (
+    CATALOG_FILE,
+    OVERRIDES_FILE,
+    Catalog,
+    FilenameHash,
+    catalog_relations,
+    load_catalog,
+    load_overrides,
+)
+from atomic_write import open_atomic
+from paliscriptconverter import TABLES_FILE
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "snapshot")
+# bump when the Snapshot layout changes
+SNAPSHOT_VERSION = 1
+
+_CODE_FILES = tuple(
+    os.path.abspath(module.__file__) for module in (books_matn, tpo_map, paliscriptconverter)
+) + (os.path.abspath(__file__),)
+
+
+class Snapshot(NamedTuple):
+    catalog: Catalog
+    filename_hash: FilenameHash
+    relations: Dict[str, Dict[str, list]]
+    titles: Dict[str, Dict[str, str]]  # {script: {FileName: title}}
+    tpo_map: Dict[str, dict]  # tpo_map.json entries
+
+
+def snapshot_key(catalog_file: str = CATALOG_FILE, overrides_file: str = OVERRIDES_FILE) -> str:
+    h = hashlib.sha256(b"snapshot v%d" % SNAPSHOT_VERSION)
+    for path in (catalog_file, overrides_file, TABLES_FILE) + _CODE_FILES:
+        with open(path, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+def build_snapshot(catalog_file: str = CATALOG_FILE, overrides_file: str = OVERRIDES_FILE) -> Snapshot:
+    catalog = load_catalog(catalog_file, load_overrides(overrides_file))
+    titles = tpo_map.title_tables(catalog)
+    return Snapshot(
+        catalog,
+        FilenameHash.build(catalog.table.file_name),
+        catalog_relations(catalog),
+        titles,
+        tpo_map.TpoModel(catalog, titles).entries(tpo_map.PROFILES[0]),
+    )
+
+
+def _dumps(snapshot: Snapshot) -> bytes:
+    # books and books_by_file are views of the table, rebuilt on load
+    c = snapshot.catalog
+    state = (c.table, c.edges, c.families, c.bitmaps, c.jumps) + tuple(snapshot[1:])
+    return pickle.dumps((SNAPSHOT_VERSION, state), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _loads(data: bytes) -> Optional[Snapshot]:
+    version, state = pickle.loads(data)
+    if version != SNAPSHOT_VERSION:
+        return None
+    table, edges, families, bitmaps, jumps, *derived = state
+    books = tuple(table)
+    books_by_file = MappingProxyType({book.FileName: book for book in books})
+    catalog = Catalog(table, books, books_by_file, edges, families, bitmaps, jumps)
+    return Snapshot(catalog, *derived)
+
+
+def load_snapshot(
+    catalog_file: str = CATALOG_FILE,
+    overrides_file: str = OVERRIDES_FILE,
+    snapshot_dir: str = SNAPSHOT_DIR,
+) -> Snapshot:
+    """The snapshot for the current inputs, built and saved first if missing.
+
+    The file is a pickle under this checkout's .cache; do not point
+    ``snapshot_dir`` at a location others can write to.
+    """
+    path = os.path.join(snapshot_dir, snapshot_key(catalog_file, overrides_file)[:32] + ".pickle")
+    try:
+        with open(path, "rb") as f:
+            snapshot = _loads(f.read())
+        if snapshot is not None:
+            return snapshot
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+
+    snapshot = build_snapshot(catalog_file, overrides_file)
+    with open_atomic(path) as f:
+        f.write(_dumps(snapshot))
+    for name in os.listdir(snapshot_dir):
+        if name.endswith(".pickle") and os.path.join(snapshot_dir, name) != path:
+            os.unlink(os.path.join(snapshot_dir, name))
+    return snapshot
+
+
+_snapshot: Optional[Snapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot() -> Snapshot:
+    """Process-wide snapshot, loaded on first use."""
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = load_snapshot()
+    return _snapshot
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    snapshot = get_snapshot()
+    print(
+        f"{len(snapshot.catalog.books)} books, {len(snapshot.titles)} title tables"
+        f" in {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
@@ -0,0 +1,246 @@
+"""JSON map for tipitakapali.org
+
+Python port of tpo_map.js: builds books.json and the tpo_map profiles
+(tpo_map.json, tpo_map_min.json, ...) straight from the catalog, in memory.
+
+python3 tpo_map.py --check    # compare to_title_case with toTitleCase of tpo_map.js (needs node)
+"""
+
+import os
+import re
+import sys
+import json
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from books_matn import Catalog, get_json_backend, iter_rows
+from paliscriptconverter import SCRIPTS, convert_path, convert_to_sinh, get_segment_cache, reload_tables
+
+# scripts of the per-script title tables, output/titles/<script>.json
+TITLE_SCRIPTS = tuple(script.lower() for script in SCRIPTS)
+
+
+# toTitleCase of tpo_map.js in one scan of the lowercased text: " > " for
+# "/", "·/" and "· >" -> ". > ", "· " -> ".", ".>" -> ". >", and an upper-case
+# first letter after a space, "/" or '"' (quotes end up without the spaces
+# the JS version adds around them and removes again)
+_TITLE_TOKEN = re.compile(r'·/|· >|· |\.>|/|(?<![^ /"])[^ /"]')
+_TITLE_REPLACE = {"·/": ". > ", "· >": ". >", "· ": ".", ".>": ". >", "/": " > "}
+
+
+def _title_token(m) -> str:
+    token = m.group()
+    replaced = _TITLE_REPLACE.get(token)
+    if replaced is not None:
+        return replaced
+    # JS charAt(0) is a UTF-16 unit, so astral letters stay as they are
+    return token.upper() if token < "\U00010000" else token
+
+
+def to_title_case(text: str) -> str:
+    if not text:
+        return ""
+    return _TITLE_TOKEN.sub(_title_token, text.lower())
+
+
+def from_to_this_pali_scr_2_char(pali_text: str, from_script="hi", target_script="ro") -> str:
+    if target_script == "si":
+        return convert_to_sinh(pali_text, from_script)
+    return to_title_case(convert_path(pali_text, from_script, target_script))
+
+
+def iter_romanized_books(books: Iterable[dict]) -> Iterator[dict]:
+    """Copies of ``books`` with Roman nav paths, as written to books.json,
+    one at a time."""
+    for book in books:
+        book = dict(book)
+        if book["LongNavPath"]:
+            book["LongNavPath"] = from_to_this_pali_scr_2_char(book["LongNavPath"], "hi", "ro")
+        if book["ShortNavPath"]:
+            book["ShortNavPath"] = from_to_this_pali_scr_2_char(book["ShortNavPath"], "hi", "ro")
+        yield book
+
+
+def nav_title(pali_text: str, target_script: str, from_script="hi") -> str:
+    return to_title_case(convert_path(pali_text, from_script, target_script))
+
+
+_title_paths: Tuple[str, ...] = ()
+
+
+def _init_title_worker(paths: Tuple[str, ...]):
+    global _title_paths
+    _title_paths = paths
+    reload_tables()
+
+
+def _script_titles(script: str) -> List[str]:
+    titles = [nav_title(path, script) if path else "" for path in _title_paths]
+    get_segment_cache().save()
+    return titles
+
+
+def title_tables(
+    catalog: Catalog, scripts: Sequence[str] = TITLE_SCRIPTS, processes: Optional[int] = None
+) -> Dict[str, Dict[str, str]]:
+    """{script: {FileName: LongNavPath title}} for each of ``scripts``.
+
+    One task per script on a process pool; the nav paths are taken from the
+    parsed catalog once and handed to each worker when it starts. With
+    ``processes=1`` everything runs in this process.
+    """
+    table = catalog.table
+    paths = tuple(table.long_nav_path)
+    processes = min(len(scripts), processes or os.cpu_count() or 1)
+    if processes <= 1:
+        _init_title_worker(paths)
+        results = [_script_titles(script) for script in scripts]
+    else:
+        # not fork: the build calls this from a worker thread
+        start = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(
+            processes,
+            mp_context=multiprocessing.get_context(start),
+            initializer=_init_title_worker,
+            initargs=(paths,),
+        ) as pool:
+            results = list(pool.map(_script_titles, scripts))
+    return {script: dict(zip(table.file_name, titles)) for script, titles in zip(scripts, results)}
+
+
+# every field a tpo_map entry can have, in entry order; m, a and t follow y
+TPO_FIELDS = ("title", "matn", "y", "m", "a", "t")
+
+
+class Profile(NamedTuple):
+    """One tpo_map output: the fields of each entry, the script of "title",
+    pretty or minified JSON, and the books it covers as
+    ``BookBitmaps.select`` fields (every book by default)."""
+
+    file_name: str
+    fields: Tuple[str, ...] = TPO_FIELDS
+    script: str = "ro"
+    pretty: bool = True
+    select: Optional[Mapping[str, object]] = None
+
+
+PROFILES = (
+    Profile("tpo_map.json"),
+    Profile("tpo_map_min.json", ("m", "a", "t"), pretty=False),
+)
+
+
+class TpoModel:
+    """What every Profile is rendered from: the catalog rows, their jumps
+    and the title tables, each title script converted once."""
+
+    def __init__(self, catalog: Catalog, titles: Optional[Mapping[str, Mapping[str, str]]] = None):
+        self.catalog = catalog
+        self.titles: Dict[str, Mapping[str, str]] = dict(titles or {})
+
+    def prepare(self, profiles: Iterable[Profile]):
+        """Convert the titles ``profiles`` need in one title_tables call."""
+        missing = sorted({p.script for p in profiles if "title" in p.fields} - self.titles.keys())
+        if missing:
+            self.titles.update(title_tables(self.catalog, missing))
+
+    def entries(self, profile: Profile) -> Dict[str, dict]:
+        unknown = set(profile.fields) - set(TPO_FIELDS)
+        if unknown:
+            raise ValueError(f"{profile.file_name}: unknown fields {sorted(unknown)}")
+        self.prepare((profile,))
+        fields = set(profile.fields)
+        catalog = self.catalog
+        jumps = catalog.jumps
+        titles = self.titles.get(profile.script)
+        if profile.select is None:
+            rows: Iterable[int] = range(len(catalog.books))
+        else:
+            rows = iter_rows(catalog.bitmaps.select(**profile.select))
+
+        entries = {}
+        for row in rows:
+            book = catalog.books[row]
+            if book.FileName in entries:
+                raise ValueError(f"Stopped: Duplicate FileName: {book.FileName}")
+
+            entry = entries[book.FileName] = {}
+            if "title" in fields:
+                entry["title"] = titles[book.FileName]
+            if "matn" in fields:
+                entry["matn"] = book.Matn.name if book.Matn else None
+            y = jumps.y[row]
+            if "y" in fields:
+                entry["y"] = y
+            for key in y:
+                if key in fields:
+                    entry[key] = getattr(jumps, key)[row]
+        return entries
+
+    def render(self, profile: Profile) -> str:
+        return get_json_backend().dumps(self.entries(profile), profile.pretty)
+
+
+def _pretty(data) -> str:
+    return get_json_backend().dumps(data, pretty=True)
+
+
+def titles_json(tables: Mapping[str, Mapping[str, str]]) -> Dict[str, str]:
+    """output/titles/<script>.json texts of title_tables(), keyed by output filename."""
+    return {f"titles/{script}.json": _pretty(titles) for script, titles in tables.items()}
+
+
+JS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tpo_map.js")
+
+# toTitleCase alone: requiring tpo_map.js would regenerate the maps
+_JS_CHECK = """
+const source = require("fs").readFileSync(process.argv[1], "utf8");
+const toTitleCase = new Function(source.match(/^function toTitleCase[^]*?^}/m)[0] + "; return toTitleCase")();
+const texts = JSON.parse(require("fs").readFileSync(0, "utf8"));
+console.log(JSON.stringify(texts.map(toTitleCase)));
+"""
+
+# the characters toTitleCase treats specially, Pāli letters, and a few whose
+# case mapping changes their length or depends on context
+_FUZZ_ALPHABET = ' /"·.>-' + "abcāīūṃṅñṭḍṇḷ" + "ABCĀĪŪṂ" + "ßİŉΣσς" + "\U00010400\U00010428"
+
+
+def fuzz_texts(count: int = 20000, seed: int = 0) -> List[str]:
+    """Random short strings over _FUZZ_ALPHABET, the same for the same seed."""
+    import random
+
+    rng = random.Random(seed)
+    return ["".join(rng.choices(_FUZZ_ALPHABET, k=rng.randint(0, 12))) for _ in range(count)]
+
+
+def check_title_case(texts: Iterable[str], node: str = "node") -> List[Tuple[str, str, str]]:
+    """Run ``texts`` through to_title_case and through toTitleCase of
+    tpo_map.js; returns the (text, python, js) mismatches."""
+    texts = sorted(set(texts))
+    js = json.loads(
+        subprocess.run(
+            [node, "-e", _JS_CHECK, JS_FILE],
+            input=json.dumps(texts), capture_output=True, text=True, check=True,
+        ).stdout
+    )
+    if len(js) != len(texts):
+        raise RuntimeError(f"node returned {len(js)} results for {len(texts)} texts")
+    return [(text, to_title_case(text), expected) for text, expected in zip(texts, js) if to_title_case(text) != expected]
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["--check"]:
+        sys.exit(__doc__)
+    from books_matn import get_catalog
+
+    table = get_catalog().table
+    paths = [p for column in (table.long_nav_path, table.short_nav_path) for p in column if p]
+    # the nav paths as they reach to_title_case, in every script, plus fuzz
+    texts = [convert_path(path, "HI", script) for script in SCRIPTS for path in paths] + fuzz_texts()
+    mismatches = check_title_case(texts)
+    for text, got, expected in mismatches[:20]:
+        print(f"{text!r}: {got!r} != {expected!r}")
+    print(f"{len(mismatches)} mismatches")
+    sys.exit(1 if mismatches else 0)